@@ -0,0 +1,74 @@
+from collections import OrderedDict
+import threading
+
+
+MEMORY_BUDGET = 256 * 1024 * 1024
+
+
+class ChartDataCache:
+    def __init__(self, memory_budget=MEMORY_BUDGET):
+        self.memory_budget = memory_budget
+        self.memory_usage = 0
+        self.entries = OrderedDict()
+        self.chart_metadata = {}
+        self.lock = threading.Lock()
+
+    def get(self, key, version):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+
+            entry_version, chart_columns, size = entry
+            if entry_version != version:
+                self.remove_entry(key)
+                return None
+
+            self.entries.move_to_end(key)
+            return chart_columns
+
+    def put(self, key, version, chart_columns):
+        for values in chart_columns.values():
+            values.flags.writeable = False
+
+        size = sum(values.nbytes for values in chart_columns.values())
+
+        with self.lock:
+            self.remove_entry(key)
+            if size > self.memory_budget:
+                return chart_columns
+
+            self.entries[key] = (version, chart_columns, size)
+            self.memory_usage += size
+
+            while self.memory_usage > self.memory_budget:
+                evicted_key = next(iter(self.entries))
+                self.remove_entry(evicted_key)
+
+        return chart_columns
+
+    def get_metadata(self, key, file_version):
+        with self.lock:
+            chart_metadata = self.chart_metadata.get(key)
+            if chart_metadata is None or chart_metadata['file_version'] != file_version:
+                return None
+            return chart_metadata
+
+    def put_metadata(self, key, chart_metadata):
+        with self.lock:
+            self.chart_metadata[key] = chart_metadata
+
+    def remove_entry(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.memory_usage -= entry[2]
+
+    def invalidate_symbol(self, symbol):
+        with self.lock:
+            for key in [key for key in self.entries if key[0] == symbol]:
+                self.remove_entry(key)
+            for key in [key for key in self.chart_metadata if key[0] == symbol]:
+                del self.chart_metadata[key]
+
+
+chart_data_cache = ChartDataCache()
@@ -1,55 +1,380 @@
-import csv
-from datetime import date
+from datetime import date, datetime
+import hashlib
+import json
 import os
 import shutil
+import tempfile
+import threading
 
+import numpy as np
 import pandas as pd
 
+from file_handler.chart_data_cache import chart_data_cache
 
-def create_stocks_and_etf_list():
-    stocks_and_etf_list = []
 
-    with open('securities/stocks_list.csv', newline='') as stocks_list_file:
-        stocks_list_csv = csv.DictReader(stocks_list_file, delimiter=',')
-        for stock in stocks_list_csv:
-            stocks_and_etf_list.append(stock['Company Name'] + '   (' + stock['Symbol'] + ')')
+REFRESH_OVERLAP_BARS = 5
+STORED_INTERVAL = '1d'
+RESAMPLING_RULES = {
+    '2d': dict(rows=2),
+    '1wk': dict(rule='W-MON', closed='left', label='left'),
+    '1mo': dict(rule='MS'),
+    '3mo': dict(rule='QS'),
+    '1y': dict(rule='YS')
+}
+RESAMPLING_AGGREGATIONS = {
+    'Open': 'first',
+    'High': 'max',
+    'Low': 'min',
+    'Close': 'last',
+    'Volume': 'sum',
+    'Dividends': 'sum',
+    'Capital Gains': 'sum'
+}
 
-    with open('securities/etfs_list.csv', newline='') as etf_list_file:
-        etf_list_csv = csv.DictReader(etf_list_file, delimiter=',')
-        for etf in etf_list_csv:
-            stocks_and_etf_list.append(etf['Fund Name'] + '   (' + etf['Symbol'] + ')')
 
-    return stocks_and_etf_list
+symbol_locks = {}
+symbol_locks_lock = threading.Lock()
+
+
+def get_symbol_lock(symbol):
+    with symbol_locks_lock:
+        return symbol_locks.setdefault(symbol, threading.RLock())
+
+
+def replace_file(filename, write_file):
+    file_descriptor, temporary_filename = tempfile.mkstemp(dir=os.path.dirname(filename), suffix='.tmp')
+    try:
+        with os.fdopen(file_descriptor, 'wb') as filehandler:
+            write_file(filehandler)
+        os.replace(temporary_filename, filename)
+    except BaseException:
+        os.remove(temporary_filename)
+        raise
 
 
 def remove_chart_data(symbol):
     directory = os.path.join('securities', symbol)
-    shutil.rmtree(directory)
+    with get_symbol_lock(symbol):
+        shutil.rmtree(directory)
+        chart_data_cache.invalidate_symbol(symbol)
 
 
-def write_chart_data(symbol, ticker, interval):
+def get_chart_data_filename(symbol, interval, extension):
+    directory = os.path.join('securities', symbol)
+    return os.path.join(directory, f'{symbol}_{interval}.{extension}')
+
+
+def get_chart_dates(chart_data):
+    dates = pd.DatetimeIndex(chart_data.index)
+    if dates.tz is not None:
+        dates = dates.tz_localize(None)
+    return dates.normalize().to_numpy().astype('datetime64[D]')
+
+
+def format_fetch_timestamp(fetch_datetime):
+    return fetch_datetime.strftime('%Y-%m-%d %H:%M:%S')
+
+
+def get_data_version(chart_columns):
+    data_hash = hashlib.blake2b(digest_size=16)
+    for column in sorted(chart_columns):
+        data_hash.update(column.encode())
+        data_hash.update(np.ascontiguousarray(chart_columns[column]).tobytes())
+    return data_hash.hexdigest()
+
+
+def create_chart_metadata(filename, chart_columns, fetched_at):
+    dates = chart_columns['Date']
+    last_bar = {column: values[-1].item() for column, values in chart_columns.items() if column != 'Date' and len(values) > 0}
+
+    return {
+        'last_bar': last_bar,
+        'first_date': str(dates[0]) if len(dates) > 0 else None,
+        'last_date': str(dates[-1]) if len(dates) > 0 else None,
+        'row_count': len(dates),
+        'version': get_data_version(chart_columns),
+        'fetched_at': fetched_at,
+        'file_version': list(get_file_version(filename))
+    }
+
+
+def write_chart_metadata(symbol, interval, chart_metadata):
+    filename = get_chart_data_filename(symbol, interval, 'meta.json')
+    replace_file(filename, lambda filehandler: filehandler.write(json.dumps(chart_metadata).encode()))
+    chart_data_cache.put_metadata((symbol, interval), chart_metadata)
+
+
+def touch_chart_metadata(symbol, interval):
+    with get_symbol_lock(symbol):
+        check_stored_chart_data(symbol, interval)
+        chart_metadata = dict(read_chart_metadata(symbol, interval))
+        chart_metadata['fetched_at'] = format_fetch_timestamp(datetime.now())
+        write_chart_metadata(symbol, interval, chart_metadata)
+
+
+def save_chart_data(symbol, interval, chart_data, fetched_at=None):
+    filename = get_chart_data_filename(symbol, interval, 'npz')
+
+    chart_columns = {'Date': get_chart_dates(chart_data)}
+    chart_columns.update({column: chart_data[column].to_numpy() for column in chart_data.columns})
+
+    if fetched_at is None:
+        fetched_at = format_fetch_timestamp(datetime.now())
+
+    with get_symbol_lock(symbol):
+        replace_file(filename, lambda filehandler: np.savez(filehandler, **chart_columns))
+        chart_data_cache.invalidate_symbol(symbol)
+        write_chart_metadata(symbol, interval, create_chart_metadata(filename, chart_columns, fetched_at))
+
+
+CSV_DATE_FORMAT = '%m/%d/%Y'
+
+
+def export_chart_data(symbol, interval, chart_data):
+    filename = get_chart_data_filename(symbol, interval, 'csv')
+    chart_data.to_csv(filename, date_format=CSV_DATE_FORMAT)
+
+
+def find_last_line_start(filehandler):
+    file_size = filehandler.seek(0, os.SEEK_END)
+    tail_size = min(file_size, 4096)
+    filehandler.seek(file_size - tail_size)
+    tail = filehandler.read(tail_size)
+
+    last_line_start = tail.rfind(b'\n', 0, len(tail) - 1)
+    if last_line_start == -1:
+        return None, b''
+    return file_size - tail_size + last_line_start + 1, tail[last_line_start + 1:]
+
+
+def append_chart_data_export(symbol, interval, chart_data, replaced_date, new_row_count):
+    filename = get_chart_data_filename(symbol, interval, 'csv')
+    if not os.path.exists(filename):
+        export_chart_data(symbol, interval, chart_data)
+        return
+
+    with open(filename, 'rb+') as filehandler:
+        last_line_start, last_line = find_last_line_start(filehandler)
+        is_appendable = last_line_start is not None and last_line.startswith(replaced_date.strftime(CSV_DATE_FORMAT).encode() + b',')
+
+        if is_appendable:
+            filehandler.seek(last_line_start)
+            filehandler.truncate()
+            filehandler.write(chart_data.iloc[-new_row_count:].to_csv(header=False, date_format=CSV_DATE_FORMAT).encode())
+
+    if not is_appendable:
+        export_chart_data(symbol, interval, chart_data)
+
+
+def import_chart_data(symbol, interval):
+    filename = get_chart_data_filename(symbol, interval, 'csv')
+    return pd.read_csv(filename, index_col=0, parse_dates=True)
+
+
+def write_chart_data(symbol, interval, historical_data):
     directory = os.path.join('securities', symbol)
     if not os.path.exists(directory):
         os.makedirs(directory)
 
-    filename = os.path.join(directory, f'{symbol}_{interval}.csv')
-    historical_data = ticker.history(period='max', interval=interval)
-    historical_data.to_csv(filename, date_format='%m/%d/%Y')
+    with get_symbol_lock(symbol):
+        save_chart_data(symbol, interval, historical_data)
+        export_chart_data(symbol, interval, historical_data)
 
 
-def load_chart_data(symbol, interval, start_date):
-    directory = os.path.join('securities', symbol)
-    filename = os.path.join(directory, f'{symbol}_{interval}.csv')
-    chart_data = pd.read_csv(filename, index_col=0, parse_dates=True)
-    return chart_data.loc[start_date: date.today(), :]
+def get_file_version(filename):
+    file_status = os.stat(filename)
+    return file_status.st_mtime_ns, file_status.st_size
 
 
-def get_current_price(symbol, interval):
-    if symbol == '':
-        return 0.00
+def is_history_changed(chart_columns, recent_data):
+    recent_dates = get_chart_dates(recent_data)
+    stored_dates = chart_columns['Date'][:-1]
 
-    directory = os.path.join('securities', symbol)
-    filename = os.path.join(directory, f'{symbol}_{interval}.csv')
-    chart_data = pd.read_csv(filename, index_col=0, parse_dates=True)
-    current_price = chart_data['Close'].iloc[-1]
-    return current_price
+    stored_positions = np.searchsorted(stored_dates, recent_dates)
+    stored_positions = np.minimum(stored_positions, len(stored_dates) - 1)
+    is_overlapping = stored_dates[stored_positions] == recent_dates
+    if not is_overlapping.any():
+        return True
+
+    stored_close = chart_columns['Close'][stored_positions[is_overlapping]]
+    recent_close = recent_data['Close'].to_numpy()[is_overlapping]
+    if not np.allclose(stored_close, recent_close, rtol=1e-6, equal_nan=True):
+        return True
+
+    is_new = recent_dates >= chart_columns['Date'][-1]
+    for column in ['Dividends', 'Stock Splits']:
+        if column in recent_data.columns and (recent_data[column].to_numpy()[is_new] != 0).any():
+            return True
+
+    return False
+
+
+def check_stored_chart_data(symbol, interval):
+    if not os.path.exists(get_chart_data_filename(symbol, interval, 'npz')) and \
+            not os.path.exists(get_chart_data_filename(symbol, interval, 'csv')):
+        raise FileNotFoundError(f'No stored history for {symbol} ({interval})')
+
+
+def rewrite_chart_data(symbol, interval, historical_data):
+    with get_symbol_lock(symbol):
+        check_stored_chart_data(symbol, interval)
+        write_chart_data(symbol, interval, historical_data)
+
+
+def update_chart_data(symbol, market_data_provider, interval):
+    check_stored_chart_data(symbol, interval)
+
+    chart_columns = read_stored_chart_columns(symbol, interval)
+    if len(chart_columns['Date']) <= REFRESH_OVERLAP_BARS:
+        rewrite_chart_data(symbol, interval, market_data_provider.history(symbol, interval))
+        return
+
+    overlap_start_date = str(chart_columns['Date'][-REFRESH_OVERLAP_BARS])
+    recent_data = market_data_provider.history(symbol, interval, start=overlap_start_date)
+    if recent_data.empty:
+        touch_chart_metadata(symbol, interval)
+        return
+
+    if is_history_changed(chart_columns, recent_data):
+        rewrite_chart_data(symbol, interval, market_data_provider.history(symbol, interval))
+        return
+
+    new_data = recent_data[get_chart_dates(recent_data) >= chart_columns['Date'][-1]].copy()
+    if new_data.empty:
+        touch_chart_metadata(symbol, interval)
+        return
+
+    stored_data = create_chart_data_frame(chart_columns, 0, len(chart_columns['Date']) - 1)
+    new_data.index = pd.DatetimeIndex(get_chart_dates(new_data).astype('datetime64[ns]'), name='Date')
+
+    updated_data = pd.concat([stored_data, new_data.reindex(columns=stored_data.columns)])
+    with get_symbol_lock(symbol):
+        check_stored_chart_data(symbol, interval)
+        save_chart_data(symbol, interval, updated_data)
+        append_chart_data_export(symbol, interval, updated_data, pd.Timestamp(chart_columns['Date'][-1]), len(new_data))
+
+
+def load_chart_columns_file(filename):
+    with np.load(filename, allow_pickle=False) as chart_columns_file:
+        return {column: chart_columns_file[column] for column in chart_columns_file.files}
+
+
+def load_chart_metadata(symbol, interval):
+    try:
+        with open(get_chart_data_filename(symbol, interval, 'meta.json'), 'r') as filehandler:
+            return json.load(filehandler)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def get_stored_file_version(filename):
+    try:
+        return list(get_file_version(filename))
+    except FileNotFoundError:
+        return None
+
+
+def is_chart_metadata_current(chart_metadata, file_version):
+    return chart_metadata is not None and file_version is not None and chart_metadata['file_version'] == file_version
+
+
+def read_chart_metadata(symbol, interval):
+    filename = get_chart_data_filename(symbol, interval, 'npz')
+    file_version = get_stored_file_version(filename)
+    chart_metadata = chart_data_cache.get_metadata((symbol, interval), file_version)
+    if chart_metadata is not None:
+        return chart_metadata
+
+    chart_metadata = load_chart_metadata(symbol, interval)
+    if is_chart_metadata_current(chart_metadata, file_version):
+        chart_data_cache.put_metadata((symbol, interval), chart_metadata)
+        return chart_metadata
+
+    with get_symbol_lock(symbol):
+        if not os.path.exists(filename):
+            save_chart_data(symbol, interval, import_chart_data(symbol, interval))
+
+        file_version = get_stored_file_version(filename)
+        chart_metadata = load_chart_metadata(symbol, interval)
+        if is_chart_metadata_current(chart_metadata, file_version):
+            chart_data_cache.put_metadata((symbol, interval), chart_metadata)
+            return chart_metadata
+
+        fetched_at = chart_metadata['fetched_at'] if chart_metadata is not None else \
+            format_fetch_timestamp(datetime.fromtimestamp(os.path.getmtime(filename)))
+        chart_columns = load_chart_columns_file(filename)
+        chart_metadata = create_chart_metadata(filename, chart_columns, fetched_at)
+        write_chart_metadata(symbol, interval, chart_metadata)
+        chart_data_cache.put((symbol, interval), chart_metadata['version'], chart_columns)
+
+    return chart_metadata
+
+
+def read_stored_chart_columns(symbol, interval):
+    filename = get_chart_data_filename(symbol, interval, 'npz')
+    version = read_chart_metadata(symbol, interval)['version']
+    chart_columns = chart_data_cache.get((symbol, interval), version)
+    if chart_columns is not None:
+        return chart_columns
+
+    return chart_data_cache.put((symbol, interval), version, load_chart_columns_file(filename))
+
+
+def group_chart_data(chart_data, resampling_rule):
+    if 'rows' in resampling_rule:
+        group_starts = np.arange(len(chart_data)) // resampling_rule['rows'] * resampling_rule['rows']
+        return chart_data.groupby(chart_data.index[group_starts])
+    return chart_data.resample(**resampling_rule)
+
+
+def resample_chart_data(chart_data, interval):
+    resampling_rule = RESAMPLING_RULES[interval]
+    resampler = group_chart_data(chart_data, resampling_rule)
+
+    aggregations = {column: aggregation for column, aggregation in RESAMPLING_AGGREGATIONS.items() if column in chart_data.columns}
+    resampled_data = resampler.agg(aggregations)
+
+    if 'Stock Splits' in chart_data.columns:
+        split_factors = group_chart_data(chart_data['Stock Splits'].replace(0, 1), resampling_rule).prod()
+        resampled_data['Stock Splits'] = split_factors.replace(1, 0)
+
+    resampled_data = resampled_data.dropna(subset=['Close'])
+    return resampled_data[[column for column in chart_data.columns if column in resampled_data.columns]]
+
+
+def read_chart_columns(symbol, interval):
+    if interval == STORED_INTERVAL:
+        return read_stored_chart_columns(symbol, interval)
+
+    version = read_chart_metadata(symbol, STORED_INTERVAL)['version']
+    chart_columns = chart_data_cache.get((symbol, interval), version)
+    if chart_columns is not None:
+        return chart_columns
+
+    stored_chart_columns = read_stored_chart_columns(symbol, STORED_INTERVAL)
+    stored_chart_data = create_chart_data_frame(stored_chart_columns, 0, len(stored_chart_columns['Date']))
+    resampled_data = resample_chart_data(stored_chart_data, interval)
+    chart_columns = {column: resampled_data[column].to_numpy() for column in resampled_data.columns}
+    chart_columns['Date'] = get_chart_dates(resampled_data)
+
+    return chart_data_cache.put((symbol, interval), version, chart_columns)
+
+
+def create_chart_data_frame(chart_columns, start, stop):
+    dates = pd.DatetimeIndex(chart_columns['Date'][start:stop].astype('datetime64[ns]'), name='Date')
+    return pd.DataFrame({column: values[start:stop] for column, values in chart_columns.items() if column != 'Date'},
+                        index=dates)
+
+
+def load_chart_data(symbol, interval, start_date):
+    chart_columns = read_chart_columns(symbol, interval)
+    start = np.searchsorted(chart_columns['Date'], np.datetime64(start_date, 'D'), side='left')
+    stop = np.searchsorted(chart_columns['Date'], np.datetime64(date.today(), 'D'), side='right')
+    return create_chart_data_frame(chart_columns, start, stop)
+
+
+def get_last_close(symbol, interval):
+    chart_metadata = load_chart_metadata(symbol, interval)
+    if chart_metadata is None:
+        return None
+    return chart_metadata['last_bar'].get('Close')
@@ -0,0 +1,237 @@
+from contextlib import closing
+import json
+import os
+import sqlite3
+import threading
+
+
+METADATA_DATABASE = 'securities/metadata.db'
+SCHEMA_VERSION = 2
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS securities (
+    symbol TEXT PRIMARY KEY,
+    position INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS chart_settings_snapshots (
+    id INTEGER PRIMARY KEY,
+    symbol TEXT NOT NULL REFERENCES securities (symbol) ON DELETE CASCADE,
+    saved_at TEXT NOT NULL,
+    chart_settings TEXT NOT NULL,
+    UNIQUE (symbol, saved_at)
+);
+
+CREATE TABLE IF NOT EXISTS security_portfolio (
+    symbol TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    pieces_owned INTEGER NOT NULL,
+    total_purchase_price REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS portfolio_trades (
+    id INTEGER PRIMARY KEY,
+    symbol TEXT NOT NULL,
+    traded_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    side TEXT NOT NULL CHECK (side IN ('buy', 'sell')),
+    pieces INTEGER NOT NULL,
+    price REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS portfolio_checkpoint (
+    last_trade_id INTEGER NOT NULL
+);
+
+INSERT INTO portfolio_checkpoint (last_trade_id)
+SELECT 0 WHERE NOT EXISTS (SELECT 1 FROM portfolio_checkpoint);
+'''
+LEGACY_SECURITY_LIST = 'securities/security_list.txt'
+LEGACY_SECURITY_PORTFOLIO = 'securities/security_portfolio.json'
+COMPACTION_INTERVAL = 100
+
+is_schema_ready = False
+schema_lock = threading.Lock()
+
+
+def read_legacy_lines(filename):
+    if not os.path.exists(filename):
+        return []
+
+    with open(filename, 'r') as filehandler:
+        return [line.rstrip('\n') for line in filehandler if line.strip() != '']
+
+
+def migrate_legacy_files(connection):
+    for position, symbol in enumerate(read_legacy_lines(LEGACY_SECURITY_LIST)):
+        connection.execute('INSERT OR IGNORE INTO securities (symbol, position) VALUES (?, ?)', (symbol, position))
+
+        directory = os.path.join('securities', symbol)
+        for saved_at in read_legacy_lines(os.path.join(directory, 'chart_settings_list.txt')):
+            filename = os.path.join(directory, f'{symbol}_{saved_at}.json')
+            if not os.path.exists(filename):
+                continue
+
+            with open(filename, 'r') as filehandler:
+                connection.execute('INSERT OR IGNORE INTO chart_settings_snapshots (symbol, saved_at, chart_settings) VALUES (?, ?, ?)',
+                                   (symbol, saved_at, filehandler.read()))
+
+    if os.path.exists(LEGACY_SECURITY_PORTFOLIO):
+        with open(LEGACY_SECURITY_PORTFOLIO, 'r') as filehandler:
+            write_security_portfolio(connection, json.load(filehandler))
+
+
+def prepare_schema(connection):
+    global is_schema_ready
+
+    with schema_lock:
+        if is_schema_ready:
+            return
+
+        with connection:
+            user_version = connection.execute('PRAGMA user_version').fetchone()[0]
+            if user_version < SCHEMA_VERSION:
+                connection.executescript(SCHEMA)
+                if user_version == 0:
+                    migrate_legacy_files(connection)
+                connection.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+
+        is_schema_ready = True
+
+
+def connect():
+    connection = sqlite3.connect(METADATA_DATABASE)
+    connection.execute('PRAGMA foreign_keys = ON')
+    prepare_schema(connection)
+    return connection
+
+
+def get_security_list():
+    with closing(connect()) as connection:
+        return [symbol for symbol, in connection.execute('SELECT symbol FROM securities ORDER BY position')]
+
+
+def add_security_to_security_list(symbol):
+    with closing(connect()) as connection, connection:
+        connection.execute('INSERT OR IGNORE INTO securities (symbol, position) '
+                           'SELECT ?, COALESCE(MAX(position) + 1, 0) FROM securities', (symbol,))
+
+
+def remove_security_from_security_list(symbol):
+    with closing(connect()) as connection, connection:
+        connection.execute('DELETE FROM securities WHERE symbol = ?', (symbol,))
+
+
+def is_security_in_security_list(symbol):
+    with closing(connect()) as connection:
+        return connection.execute('SELECT 1 FROM securities WHERE symbol = ?', (symbol,)).fetchone() is not None
+
+
+def get_chart_settings_lists():
+    chart_settings_lists = {}
+
+    with closing(connect()) as connection:
+        for symbol, saved_at in connection.execute('SELECT symbol, saved_at FROM chart_settings_snapshots ORDER BY id'):
+            chart_settings_lists.setdefault(symbol, []).append(saved_at)
+
+    return chart_settings_lists
+
+
+def load_chart_settings(symbol, saved_at):
+    with closing(connect()) as connection:
+        chart_settings, = connection.execute('SELECT chart_settings FROM chart_settings_snapshots WHERE symbol = ? AND saved_at = ?',
+                                             (symbol, saved_at)).fetchone()
+        return json.loads(chart_settings)
+
+
+def save_chart_settings(chart_settings, saved_at):
+    if chart_settings['symbol'] == '':
+        return
+
+    with closing(connect()) as connection, connection:
+        connection.execute('INSERT OR REPLACE INTO chart_settings_snapshots (symbol, saved_at, chart_settings) '
+                           'SELECT symbol, ?, ? FROM securities WHERE symbol = ?',
+                           (saved_at, json.dumps(chart_settings), chart_settings['symbol']))
+
+
+def remove_chart_settings(symbol, saved_at):
+    with closing(connect()) as connection, connection:
+        connection.execute('DELETE FROM chart_settings_snapshots WHERE symbol = ? AND saved_at = ?', (symbol, saved_at))
+
+
+def apply_trade(security, side, pieces, price):
+    if side == 'buy':
+        security['pieces_owned'] += pieces
+        security['total_purchase_price'] += pieces * price
+        return
+
+    pieces = min(pieces, security['pieces_owned'])
+    security['pieces_owned'] -= pieces
+    security['total_purchase_price'] -= pieces * price
+
+    if security['pieces_owned'] == 0:
+        security['total_purchase_price'] = 0
+
+
+def read_security_portfolio(connection):
+    rows = connection.execute('SELECT symbol, pieces_owned, total_purchase_price FROM security_portfolio ORDER BY position')
+    security_portfolio = [{'symbol': symbol, 'pieces_owned': pieces_owned, 'total_purchase_price': total_purchase_price}
+                          for symbol, pieces_owned, total_purchase_price in rows]
+    symbol_to_security = {security['symbol']: security for security in security_portfolio}
+
+    last_trade_id, = connection.execute('SELECT last_trade_id FROM portfolio_checkpoint').fetchone()
+    for symbol, side, pieces, price in connection.execute('SELECT symbol, side, pieces, price FROM portfolio_trades WHERE id > ? ORDER BY id',
+                                                          (last_trade_id,)):
+        if symbol in symbol_to_security:
+            apply_trade(symbol_to_security[symbol], side, pieces, price)
+
+    return security_portfolio
+
+
+def load_security_portfolio():
+    with closing(connect()) as connection:
+        return read_security_portfolio(connection)
+
+
+def write_security_portfolio(connection, security_portfolio):
+    connection.execute('DELETE FROM security_portfolio')
+    connection.executemany('INSERT INTO security_portfolio (symbol, position, pieces_owned, total_purchase_price) VALUES (?, ?, ?, ?)',
+                           [(security['symbol'], position, security['pieces_owned'], security['total_purchase_price'])
+                            for position, security in enumerate(security_portfolio)])
+    connection.execute('UPDATE portfolio_checkpoint SET last_trade_id = (SELECT COALESCE(MAX(id), 0) FROM portfolio_trades)')
+
+
+def compact_portfolio_trades(connection):
+    write_security_portfolio(connection, read_security_portfolio(connection))
+
+
+def append_trade(symbol, side, pieces, price):
+    with closing(connect()) as connection, connection:
+        trade_id = connection.execute('INSERT INTO portfolio_trades (symbol, side, pieces, price) VALUES (?, ?, ?, ?)',
+                                      (symbol, side, pieces, price)).lastrowid
+
+        last_trade_id, = connection.execute('SELECT last_trade_id FROM portfolio_checkpoint').fetchone()
+        if trade_id - last_trade_id >= COMPACTION_INTERVAL:
+            compact_portfolio_trades(connection)
+
+
+def get_portfolio_trades(symbol=None):
+    query = 'SELECT symbol, traded_at, side, pieces, price FROM portfolio_trades'
+    parameters = ()
+    if symbol is not None:
+        query += ' WHERE symbol = ?'
+        parameters = (symbol,)
+
+    with closing(connect()) as connection:
+        return [{'symbol': symbol, 'traded_at': traded_at, 'side': side, 'pieces': pieces, 'price': price}
+                for symbol, traded_at, side, pieces, price in connection.execute(query + ' ORDER BY id', parameters)]
+
+
+def add_security_to_security_portfolio(symbol):
+    with closing(connect()) as connection, connection:
+        connection.execute('INSERT OR IGNORE INTO security_portfolio (symbol, position, pieces_owned, total_purchase_price) '
+                           'SELECT ?, COALESCE(MAX(position) + 1, 0), 0, 0 FROM security_portfolio', (symbol,))
+
+
+def remove_security_from_security_portfolio(symbol):
+    with closing(connect()) as connection, connection:
+        compact_portfolio_trades(connection)
+        connection.execute('DELETE FROM security_portfolio WHERE symbol = ?', (symbol,))
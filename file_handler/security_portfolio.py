@@ -0,0 +1,45 @@
+from file_handler import metadata_store
+
+
+class SecurityPortfolio:
+    def __init__(self):
+        self.securities = []
+        self.symbol_to_security = {}
+
+        self.reload()
+
+    def __iter__(self):
+        return iter(self.securities)
+
+    def reload(self):
+        self.securities = metadata_store.load_security_portfolio()
+        self.symbol_to_security = {security['symbol']: security for security in self.securities}
+
+    def find_security(self, symbol):
+        return self.symbol_to_security.get(symbol)
+
+    def get_pieces_owned(self, symbol):
+        security = self.find_security(symbol)
+        if security is None:
+            return 0
+        return security['pieces_owned']
+
+    def get_ownership_info(self, symbol):
+        security = self.find_security(symbol)
+        if security is None:
+            return 0, 0
+        return security['pieces_owned'], security['total_purchase_price']
+
+    def trade(self, symbol, side, pieces, price):
+        security = self.find_security(symbol)
+        if security is None:
+            return False
+
+        if side == 'sell':
+            pieces = min(pieces, security['pieces_owned'])
+        if pieces == 0:
+            return False
+
+        metadata_store.append_trade(symbol, side, pieces, price)
+        metadata_store.apply_trade(security, side, pieces, price)
+        return True
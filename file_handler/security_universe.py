@@ -0,0 +1,96 @@
+import csv
+import os
+import threading
+
+import numpy as np
+
+
+UNIVERSE_SOURCES = [('securities/stocks_list.csv', 'Company Name'),
+                    ('securities/etfs_list.csv', 'Fund Name')]
+UNIVERSE_SNAPSHOT = 'securities/security_universe.npz'
+
+
+class SecurityUniverse:
+    def __init__(self, symbols, names, source_versions):
+        self.symbols = symbols
+        self.names = names
+        self.source_versions = source_versions
+        self.entries = [name + '   (' + symbol + ')' for symbol, name in zip(symbols, names)]
+
+        self.entry_to_symbol = dict(zip(self.entries, self.symbols))
+        self.symbol_to_name = {}
+        for symbol, name in zip(self.symbols, self.names):
+            self.symbol_to_name.setdefault(symbol, name)
+
+    def get_symbol(self, entry):
+        return self.entry_to_symbol.get(entry, entry)
+
+    def get_name(self, symbol):
+        return self.symbol_to_name.get(symbol)
+
+
+def get_source_versions():
+    source_versions = []
+    for filename, name_column in UNIVERSE_SOURCES:
+        file_status = os.stat(filename)
+        source_versions.extend([file_status.st_mtime_ns, file_status.st_size])
+    return source_versions
+
+
+def read_universe_sources():
+    symbols = []
+    names = []
+
+    for filename, name_column in UNIVERSE_SOURCES:
+        with open(filename, newline='') as filehandler:
+            for security in csv.DictReader(filehandler, delimiter=','):
+                symbols.append(security['Symbol'])
+                names.append(security[name_column])
+
+    return symbols, names
+
+
+def read_universe_snapshot(source_versions):
+    if not os.path.exists(UNIVERSE_SNAPSHOT):
+        return None
+
+    with np.load(UNIVERSE_SNAPSHOT) as snapshot:
+        if snapshot['source_versions'].tolist() != source_versions:
+            return None
+        return snapshot['symbols'].tolist(), snapshot['names'].tolist()
+
+
+def write_universe_snapshot(symbols, names, source_versions):
+    temporary_filename = UNIVERSE_SNAPSHOT + '.tmp'
+
+    with open(temporary_filename, 'wb') as filehandler:
+        np.savez(filehandler,
+                 symbols=np.array(symbols, dtype=str),
+                 names=np.array(names, dtype=str),
+                 source_versions=np.array(source_versions, dtype=np.int64))
+    os.replace(temporary_filename, UNIVERSE_SNAPSHOT)
+
+
+def load_security_universe():
+    source_versions = get_source_versions()
+
+    universe = read_universe_snapshot(source_versions)
+    if universe is None:
+        universe = read_universe_sources()
+        write_universe_snapshot(*universe, source_versions)
+
+    symbols, names = universe
+    return SecurityUniverse(symbols, names, source_versions)
+
+
+security_universe = None
+security_universe_lock = threading.Lock()
+
+
+def get_security_universe():
+    global security_universe
+
+    with security_universe_lock:
+        if security_universe is None or security_universe.source_versions != get_source_versions():
+            security_universe = load_security_universe()
+        return security_universe
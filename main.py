@@ -1,16 +1,50 @@
 from datetime import datetime
-import re
+import sys
+import time
 import tkinter as tk
 
-import yfinance as yf
+STARTUP_TIME = time.perf_counter()
 
-from file_handler import csv_handler, json_handler, txt_handler
-from ui import (Chart,
-                ChartDisplaySettings,
+# The project imports come after STARTUP_TIME so the startup report includes them.
+from file_handler import csv_handler, metadata_store  # noqa: E402
+from file_handler.security_portfolio import SecurityPortfolio  # noqa: E402
+from file_handler.security_universe import get_security_universe  # noqa: E402
+from market_data import BackgroundFetcher, YFinanceProvider, refresh_all  # noqa: E402
+from ui import (ChartDisplaySettings,  # noqa: E402
                 SecurityFinder,
                 SecurityPortfolioManager,
+                SettingsScheduler,
                 TechnicalIndicatorsSettingsLeft,
-                TechnicalIndicatorsSettingsRight)
+                TechnicalIndicatorsSettingsRight,
+                UIState)
+from ui.ui_state import (ALL_FRAMES,  # noqa: E402
+                         CHART,
+                         CHART_DISPLAY_SETTINGS,
+                         SECURITY_LIST,
+                         SECURITY_PORTFOLIO,
+                         TECHNICAL_INDICATORS_SETTINGS_LEFT,
+                         TECHNICAL_INDICATORS_SETTINGS_RIGHT)
+
+
+SHOW_STARTUP_REPORT = '--startup-report' in sys.argv
+USE_REPLAY_PROVIDER = '--replay' in sys.argv
+SCAN_CANDLESTICK_PATTERNS = '--scan-patterns' in sys.argv
+REPLAY_SYNTHETIC_LENGTH = 2500
+SCAN_INTERVALS = ['1d', '1wk', '1mo']
+startup_stages = []
+
+
+def record_startup_stage(stage):
+    startup_stages.append((stage, time.perf_counter() - STARTUP_TIME))
+
+
+def print_startup_report():
+    if not SHOW_STARTUP_REPORT:
+        return
+
+    print('Startup timing')
+    for stage, elapsed in startup_stages:
+        print(f'  {stage:<20}{elapsed * 1000:8.0f} ms')
 
 
 def load_default_chart_settings():
@@ -42,34 +76,82 @@ def load_default_chart_settings():
     }
 
 
+def create_market_data_provider():
+    if USE_REPLAY_PROVIDER:
+        from market_data import ReplayProvider
+        return ReplayProvider(synthetic_length=REPLAY_SYNTHETIC_LENGTH)
+    return YFinanceProvider()
+
+
+def print_candlestick_pattern_scan():
+    from technical_indicators import candlestick_patterns
+
+    chart_columns_list = []
+    for symbol in metadata_store.get_security_list():
+        for interval in SCAN_INTERVALS:
+            chart_columns_list.append(((symbol, interval), csv_handler.read_chart_columns(symbol, interval)))
+
+    signals = candlestick_patterns.scan_candlestick_patterns(chart_columns_list)
+    print(signals[(signals != 0).any(axis=1)].to_string())
+
+
 def find_entry_in_stocks_and_etf_list(entry):
-    for stock_or_etf in csv_handler.create_stocks_and_etf_list():
-        if entry == stock_or_etf:
-            split_string = re.split('[()]', entry)
-            symbol = split_string[len(split_string) - 2]
-            return symbol
-    return entry
+    return get_security_universe().get_symbol(entry)
+
+
+def download_security_files(job, market_data_provider, symbol):
+    job.report_progress(f'Downloading {symbol} ...')
+    historical_data = market_data_provider.history(symbol, csv_handler.STORED_INTERVAL)
+    if historical_data.empty:
+        return False
+
+    job.report_progress(f'Saving {symbol} ...')
+    csv_handler.write_chart_data(symbol, csv_handler.STORED_INTERVAL, historical_data)
+    return True
+
+
+def refresh_security_files(job, market_data_provider, symbol):
+    job.report_progress(f'Refreshing {symbol} ...')
+    csv_handler.update_chart_data(symbol, market_data_provider, csv_handler.STORED_INTERVAL)
 
 
-def create_security_files(symbol, ticker):
-    txt_handler.add_security_to_security_list(symbol)
-    for interval in ['1d', '1wk', '1mo']:
-        csv_handler.write_chart_data(symbol, ticker, interval)
-    txt_handler.create_chart_settings_list(symbol)
-    json_handler.add_security_to_security_portfolio(symbol)
+def refresh_listed_security_files(market_data_provider, symbol):
+    if metadata_store.is_security_in_security_list(symbol):
+        csv_handler.update_chart_data(symbol, market_data_provider, csv_handler.STORED_INTERVAL)
+
+
+def refresh_all_security_files(job, market_data_provider, security_list):
+    job.report_progress(f'Refreshing 0 / {len(security_list)} ...')
+    return refresh_all(job,
+                       security_list,
+                       lambda symbol: refresh_listed_security_files(market_data_provider, symbol))
+
+
+def create_security_files(symbol):
+    metadata_store.add_security_to_security_list(symbol)
+    metadata_store.add_security_to_security_portfolio(symbol)
 
 
 class Main(tk.Tk):
-    def __init__(self, title):
+    def __init__(self, title, market_data_provider):
+        record_startup_stage('imports')
         super().__init__()
         self.title(title)
         self.geometry(f'{self.winfo_screenwidth()}x{self.winfo_screenheight()}')
         self.iconphoto(False, tk.PhotoImage(file='images/stockimage.png'))
+        record_startup_stage('window')
 
         self.interval = tk.StringVar()
+        self.market_data_provider = market_data_provider
         self.default_chart_settings = load_default_chart_settings()
         self.chart_settings = self.default_chart_settings.copy()
-        self.security_portfolio = json_handler.load_security_portfolio()
+        self.ui_state = UIState(self.chart_settings)
+        self.render_scheduled = False
+        self.chart_previewed = False
+        self.settings_scheduler = SettingsScheduler(self, self.chart_settings_previewed, self.chart_settings_changed)
+        self.security_portfolio = SecurityPortfolio()
+        self.fetch_status = tk.StringVar()
+        self.background_fetcher = BackgroundFetcher(self)
 
         self.chart_ui = None
         self.chart_frame = None
@@ -85,68 +167,158 @@ class Main(tk.Tk):
         self.security_portfolio_manager_frame = None
 
         self.create_widgets()
-        self.protocol('WM_DELETE_WINDOW', self.quit)
+        self.protocol('WM_DELETE_WINDOW', self.close)
         self.mainloop()
 
+    def close(self):
+        self.settings_scheduler.cancel()
+        self.background_fetcher.shutdown()
+        self.quit()
+
     def create_widgets(self):
         self.create_security_finder_frame()
-        self.create_chart_frame()
         self.create_chart_display_settings_frame()
         self.create_technical_indicators_settings_left_frame()
         self.create_technical_indicators_settings_right_frame()
         self.create_security_portfolio_manager_frame()
-
-    def update_ui(self):
-        self.create_widgets()
+        self.ui_state.collect_dirty_frames()
+
+        self.update_idletasks()
+        record_startup_stage('first paint')
+        self.after_idle(self.create_chart_frame)
+        self.after_idle(self.security_finder_ui.get_security_search_index)
+
+    def update_ui(self, *frames):
+        self.ui_state.mark_dirty(*frames)
+
+        if not self.render_scheduled:
+            self.render_scheduled = True
+            self.after_idle(self.render_dirty_frames)
+
+    def render_dirty_frames(self):
+        self.render_scheduled = False
+
+        dirty_frames = self.ui_state.collect_dirty_frames()
+        if CHART in dirty_frames:
+            self.update_chart_frame()
+            dirty_frames |= self.ui_state.collect_dirty_frames()
+
+        frame_updates = {
+            SECURITY_LIST: self.update_security_finder_frame,
+            CHART_DISPLAY_SETTINGS: self.update_chart_display_settings_frame,
+            TECHNICAL_INDICATORS_SETTINGS_LEFT: self.update_technical_indicators_settings_left_frame,
+            TECHNICAL_INDICATORS_SETTINGS_RIGHT: self.update_technical_indicators_settings_right_frame,
+            SECURITY_PORTFOLIO: self.update_security_portfolio_manager_frame
+        }
+        for frame in ALL_FRAMES:
+            if frame in dirty_frames and frame in frame_updates:
+                frame_updates[frame]()
 
     def update_security_finder_frame(self):
-        self.create_security_finder_frame()
+        self.security_finder_ui.update_security_list(self.security_portfolio)
 
     def update_chart_frame(self):
-        self.create_chart_frame()
+        self.settings_scheduler.cancel()
+        self.chart_previewed = False
+        if self.chart_ui is not None:
+            self.chart_ui.plot_chart(self.chart_settings)
 
     def update_chart_display_settings_frame(self):
-        self.create_chart_display_settings_frame()
+        self.chart_display_settings_ui.update_widgets()
 
     def update_technical_indicators_settings_left_frame(self):
-        self.create_technical_indicators_settings_left_frame()
+        self.technical_indicators_settings_left_ui.update_widgets()
 
     def update_technical_indicators_settings_right_frame(self):
-        self.create_technical_indicators_settings_right_frame()
+        self.technical_indicators_settings_right_ui.update_widgets()
 
     def update_security_portfolio_manager_frame(self):
-        self.create_security_portfolio_manager_frame()
+        self.security_finder_ui.update_portfolio_labels(self.security_portfolio)
+        self.security_portfolio_manager_ui.update_widgets()
 
     def request_historical_market_information(self, entry):
         symbol = find_entry_in_stocks_and_etf_list(entry)
-        try:
-            ticker = yf.Ticker(symbol)
-            history = ticker.history(period="max")
 
-            if history.empty:
-                self.security_finder_ui.update_entry('Not Found!')
-            else:
-                create_security_files(symbol, ticker)
-                self.security_portfolio = json_handler.load_security_portfolio()
-                self.update_ui()
+        if metadata_store.is_security_in_security_list(symbol):
+            self.background_fetcher.submit(symbol,
+                                           lambda job: refresh_security_files(job, self.market_data_provider, symbol),
+                                           lambda result: self.security_files_refreshed(symbol),
+                                           self.fetch_failed,
+                                           self.fetch_status.set)
+        else:
+            self.background_fetcher.submit(symbol,
+                                           lambda job: download_security_files(job, self.market_data_provider, symbol),
+                                           lambda found: self.security_files_downloaded(symbol, found),
+                                           self.fetch_failed,
+                                           self.fetch_status.set)
+
+    def refresh_all_securities(self):
+        security_list = metadata_store.get_security_list()
+        if len(security_list) == 0:
+            return
+
+        self.background_fetcher.submit('refresh all',
+                                       lambda job: refresh_all_security_files(job, self.market_data_provider, security_list),
+                                       self.all_security_files_refreshed,
+                                       self.fetch_failed,
+                                       self.fetch_status.set)
+
+    def all_security_files_refreshed(self, failed_securities):
+        self.reset_fetch_status()
+
+        failed_securities = [symbol for symbol in failed_securities if metadata_store.is_security_in_security_list(symbol)]
+        if len(failed_securities) > 0:
+            self.security_finder_ui.update_entry(f'Refresh failed: {", ".join(failed_securities)}')
 
-        except Exception as e:
-            self.security_finder_ui.update_entry(f'Error: {str(e)}')
+        if self.chart_settings['symbol'] != '':
+            self.update_ui(CHART, SECURITY_PORTFOLIO)
+        else:
+            self.update_ui(SECURITY_PORTFOLIO)
+
+    def security_files_downloaded(self, symbol, found):
+        self.reset_fetch_status()
+
+        if not found:
+            self.security_finder_ui.update_entry('Not Found!')
+            return
+
+        create_security_files(symbol)
+        self.security_portfolio.reload()
+        self.update_ui(SECURITY_LIST)
+
+    def security_files_refreshed(self, symbol):
+        self.reset_fetch_status()
+
+        if self.chart_settings['symbol'] == symbol:
+            self.update_ui(CHART, SECURITY_PORTFOLIO)
+        else:
+            self.update_ui(SECURITY_PORTFOLIO)
+
+    def fetch_failed(self, error):
+        self.reset_fetch_status()
+        self.security_finder_ui.update_entry(f'Error: {str(error)}')
+
+    def reset_fetch_status(self):
+        if not self.background_fetcher.has_active_jobs():
+            self.fetch_status.set('')
 
     def remove_security(self, symbol):
-        txt_handler.remove_security_from_security_list(symbol)
+        self.background_fetcher.cancel(symbol)
+        self.reset_fetch_status()
+        metadata_store.remove_security_from_security_list(symbol)
         csv_handler.remove_chart_data(symbol)
 
-        if len(txt_handler.get_security_list()) == 0 or self.chart_settings['symbol'] == symbol:
-            self.chart_settings = self.default_chart_settings.copy()
+        if len(metadata_store.get_security_list()) == 0 or self.chart_settings['symbol'] == symbol:
+            self.ui_state.replace_chart_settings(self.default_chart_settings)
 
-        json_handler.remove_security_from_security_portfolio(symbol)
-        self.security_portfolio = json_handler.load_security_portfolio()
+        metadata_store.remove_security_from_security_portfolio(symbol)
+        self.security_portfolio.reload()
 
-        self.update_ui()
+        self.update_ui(SECURITY_LIST, SECURITY_PORTFOLIO)
 
     def plot_fullscreen(self):
-        self.chart_ui.plot_fullscreen(self.chart_settings)
+        if self.chart_ui is not None:
+            self.chart_ui.plot_fullscreen(self.chart_settings)
 
     def validate_variables(self, buy_sell_pieces, buy_sell_price):
         try:
@@ -165,108 +337,62 @@ class Main(tk.Tk):
         if not self.validate_variables(buy_sell_pieces, buy_sell_price):
             return
 
-        security = self.find_security(self.chart_settings['symbol'])
-        if security is None:
+        pieces_owned = self.security_portfolio.get_pieces_owned(self.chart_settings['symbol'])
+        if pieces_owned + int(buy_sell_pieces) > 100000:
             return
 
-        pieces_owned = security['pieces_owned']
-        total_purchase_price = security['total_purchase_price']
-
-        new_pieces_owned = pieces_owned + int(buy_sell_pieces)
-        if new_pieces_owned > 100000:
-            return
-
-        security['pieces_owned'] = new_pieces_owned
-        security['total_purchase_price'] = total_purchase_price + (int(buy_sell_pieces) * float(buy_sell_price))
-
-        self.security_portfolio_changed()
+        if self.security_portfolio.trade(self.chart_settings['symbol'], 'buy', int(buy_sell_pieces), float(buy_sell_price)):
+            self.security_portfolio_changed()
 
     def sell_security(self, buy_sell_pieces, buy_sell_price):
         if not self.validate_variables(buy_sell_pieces, buy_sell_price):
             return
 
-        security = self.find_security(self.chart_settings['symbol'])
-        if security is None:
-            return
-
-        buy_sell_pieces = int(buy_sell_pieces)
-        buy_sell_price = float(buy_sell_price)
-        pieces_owned = security['pieces_owned']
-
-        if buy_sell_pieces > pieces_owned:
-            buy_sell_pieces = pieces_owned
-
-        new_pieces_owned = pieces_owned - buy_sell_pieces
-        new_total_purchase_price = security['total_purchase_price'] - (buy_sell_pieces * buy_sell_price)
-
-        if new_pieces_owned == 0:
-            new_total_purchase_price = 0
-
-        security['pieces_owned'] = new_pieces_owned
-        security['total_purchase_price'] = new_total_purchase_price
-
-        self.security_portfolio_changed()
-
-    def find_security(self, symbol):
-        for sec in self.security_portfolio:
-            if sec['symbol'] == symbol:
-                return sec
-        return None
+        if self.security_portfolio.trade(self.chart_settings['symbol'], 'sell', int(buy_sell_pieces), float(buy_sell_price)):
+            self.security_portfolio_changed()
 
     def create_chart_frame(self):
-        if self.chart_frame is not None:
-            self.chart_frame.destroy()
+        from ui import Chart
+        record_startup_stage('charting loaded')
 
         self.chart_frame = tk.LabelFrame(self)
         self.chart_frame.place(relwidth=4 / 5, relheight=2 / 3, relx=1 / 5)
         self.chart_ui = Chart(self.chart_frame)
         self.chart_ui.plot_chart(self.chart_settings)
 
-    def create_chart_display_settings_frame(self):
-        if self.chart_display_settings_frame is not None:
-            self.chart_display_settings_frame.destroy()
+        record_startup_stage('chart ready')
+        print_startup_report()
 
+    def create_chart_display_settings_frame(self):
         self.chart_display_settings_frame = tk.LabelFrame(self)
         self.chart_display_settings_frame.place(relwidth=1 / 5, relheight=1 / 3, rely=2 / 3)
-        self.chart_display_settings_ui = ChartDisplaySettings(self.chart_display_settings_frame, self.chart_settings, self.chart_settings_changed, self.plot_fullscreen, self.save_chart_settings)
+        self.chart_display_settings_ui = ChartDisplaySettings(self.chart_display_settings_frame, self.chart_settings, self.settings_scheduler, self.plot_fullscreen, self.save_chart_settings)
 
     def create_security_finder_frame(self):
-        if self.security_finder_frame is not None:
-            self.security_finder_frame.destroy()
-
         self.security_finder_frame = tk.LabelFrame(self)
         self.security_finder_frame.place(relwidth=1 / 5, relheight=2 / 3)
-        self.security_finder_ui = SecurityFinder(self.security_finder_frame, self.entry_confirmed, self.plot_chart, self.request_historical_market_information, self.remove_security, self.security_portfolio, self.remove_chart_settings, self.load_chart_settings)
+        self.security_finder_ui = SecurityFinder(self.security_finder_frame, self.entry_confirmed, self.plot_chart, self.request_historical_market_information, self.remove_security, self.security_portfolio, self.remove_chart_settings, self.load_chart_settings, self.fetch_status, self.refresh_all_securities)
 
     def create_security_portfolio_manager_frame(self):
-        if self.security_portfolio_manager_frame is not None:
-            self.security_portfolio_manager_frame.destroy()
-
         self.security_portfolio_manager_frame = tk.LabelFrame(self)
         self.security_portfolio_manager_frame.place(relwidth=4 / 15, relheight=1 / 3, relx=11 / 15, rely=2 / 3)
-        self.security_portfolio_manager_ui = SecurityPortfolioManager(self.security_portfolio_manager_frame, self.chart_settings, self.buy_security, self.sell_security)
+        self.security_portfolio_manager_ui = SecurityPortfolioManager(self.security_portfolio_manager_frame, self.chart_settings, self.security_portfolio, self.buy_security, self.sell_security)
 
     def create_technical_indicators_settings_left_frame(self):
-        if self.technical_indicators_settings_left_frame is not None:
-            self.technical_indicators_settings_left_frame.destroy()
-
         self.technical_indicators_settings_left_frame = tk.LabelFrame(self)
         self.technical_indicators_settings_left_frame.place(relwidth=4 / 15, relheight=1 / 3, relx=1 / 5, rely=2 / 3)
-        self.technical_indicators_settings_left_ui = TechnicalIndicatorsSettingsLeft(self.technical_indicators_settings_left_frame, self.chart_settings, self.chart_settings_changed)
+        self.technical_indicators_settings_left_ui = TechnicalIndicatorsSettingsLeft(self.technical_indicators_settings_left_frame, self.chart_settings, self.settings_scheduler)
 
     def create_technical_indicators_settings_right_frame(self):
-        if self.technical_indicators_settings_right_frame is not None:
-            self.technical_indicators_settings_right_frame.destroy()
-
         self.technical_indicators_settings_right_frame = tk.LabelFrame(self)
         self.technical_indicators_settings_right_frame.place(relwidth=4 / 15, relheight=1 / 3, relx=7 / 15, rely=2 / 3)
-        self.technical_indicators_settings_right_ui = TechnicalIndicatorsSettingsRight(self.technical_indicators_settings_right_frame, self.chart_settings, self.chart_settings_changed)
+        self.technical_indicators_settings_right_ui = TechnicalIndicatorsSettingsRight(self.technical_indicators_settings_right_frame, self.chart_settings, self.settings_scheduler)
 
     def entry_confirmed(self, entry):
         self.request_historical_market_information(entry)
 
     def load_chart_settings(self, symbol, save):
-        self.chart_settings = json_handler.load_chart_settings(symbol, save)
+        self.ui_state.replace_chart_settings(metadata_store.load_chart_settings(symbol, save))
         self.update_ui()
 
     def save_chart_settings(self):
@@ -275,28 +401,39 @@ class Main(tk.Tk):
 
         current_datetime = datetime.now()
         formatted_current_datetime = current_datetime.strftime("%Y-%m-%d %H:%M:%S")
-        json_handler.save_chart_settings(self.chart_settings, formatted_current_datetime)
-        txt_handler.add_datetime_to_chart_settings_list(self.chart_settings['symbol'], formatted_current_datetime)
+        metadata_store.save_chart_settings(self.chart_settings, formatted_current_datetime)
 
-        self.update_ui()
+        self.update_ui(SECURITY_LIST)
 
     def remove_chart_settings(self, symbol, formatted_current_datetime):
-        json_handler.remove_chart_settings(symbol, formatted_current_datetime)
-        txt_handler.remove_settings_from_chart_settings_list(symbol, formatted_current_datetime)
+        metadata_store.remove_chart_settings(symbol, formatted_current_datetime)
 
-        self.update_ui()
+        self.update_ui(SECURITY_LIST)
 
     def plot_chart(self, symbol):
-        self.chart_settings = self.default_chart_settings.copy()
+        self.ui_state.replace_chart_settings(self.default_chart_settings)
         self.chart_settings['symbol'] = symbol
         self.update_ui()
 
+    def chart_settings_previewed(self):
+        if self.chart_ui is None:
+            return
+
+        self.chart_previewed = True
+        self.chart_ui.plot_chart(self.chart_settings, preview=True)
+
     def chart_settings_changed(self):
-        self.update_ui()
+        if self.chart_previewed:
+            self.update_ui(CHART)
+        else:
+            self.update_ui()
 
     def security_portfolio_changed(self):
-        json_handler.save_security_portfolio(self.security_portfolio)
-        self.update_ui()
+        self.update_ui(SECURITY_PORTFOLIO)
 
 
-Main('Praxisprojekt')
+if __name__ == '__main__':
+    if SCAN_CANDLESTICK_PATTERNS:
+        print_candlestick_pattern_scan()
+    else:
+        Main('Praxisprojekt', create_market_data_provider())
@@ -0,0 +1,11 @@
+from .background_fetcher import BackgroundFetcher, FetchCancelled
+from .bulk_refresh import TokenBucket, refresh_all
+from .market_data_provider import MarketDataProvider
+from .yfinance_provider import YFinanceProvider
+
+
+def __getattr__(name):
+    if name in ('ReplayProvider', 'generate_synthetic_history'):
+        from . import replay_provider
+        return getattr(replay_provider, name)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
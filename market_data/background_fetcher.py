@@ -0,0 +1,114 @@
+from concurrent.futures import ThreadPoolExecutor
+import queue
+import threading
+
+
+MAX_WORKERS = 4
+POLL_INTERVAL_MS = 50
+
+
+class FetchCancelled(Exception):
+    pass
+
+
+class FetchJob:
+    def __init__(self, key, function, on_done, on_error, on_progress, results, previous_job=None):
+        self.key = key
+        self.function = function
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.results = results
+        self.previous_job = previous_job
+        self.cancel_event = threading.Event()
+        self.finished_event = threading.Event()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def is_cancelled(self):
+        return self.cancel_event.is_set()
+
+    def raise_if_cancelled(self):
+        if self.is_cancelled():
+            raise FetchCancelled(self.key)
+
+    def report_progress(self, message):
+        self.raise_if_cancelled()
+        self.results.put((self, 'progress', message))
+
+
+class BackgroundFetcher:
+    def __init__(self, root, max_workers=MAX_WORKERS):
+        self.root = root
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.results = queue.Queue()
+        self.jobs = {}
+        self.unfinished_jobs = {}
+        self.poll_id = self.root.after(POLL_INTERVAL_MS, self.process_results)
+
+    def submit(self, key, function, on_done, on_error=None, on_progress=None):
+        self.cancel(key)
+
+        job = FetchJob(key, function, on_done, on_error, on_progress, self.results, self.unfinished_jobs.get(key))
+        self.jobs[key] = job
+        self.unfinished_jobs[key] = job
+        self.executor.submit(self.run_job, job)
+        return job
+
+    def run_job(self, job):
+        if job.previous_job is not None:
+            job.previous_job.finished_event.wait()
+            job.previous_job = None
+
+        try:
+            job.raise_if_cancelled()
+            result = job.function(job)
+            self.results.put((job, 'done', result))
+        except FetchCancelled:
+            self.results.put((job, 'cancelled', None))
+        except Exception as e:
+            self.results.put((job, 'error', e))
+        finally:
+            job.finished_event.set()
+
+    def process_results(self):
+        self.poll_id = self.root.after(POLL_INTERVAL_MS, self.process_results)
+
+        while True:
+            try:
+                job, state, value = self.results.get_nowait()
+            except queue.Empty:
+                break
+
+            if state != 'progress' and self.jobs.get(job.key) is job:
+                del self.jobs[job.key]
+            if state != 'progress' and self.unfinished_jobs.get(job.key) is job:
+                del self.unfinished_jobs[job.key]
+
+            if job.is_cancelled() or state == 'cancelled':
+                continue
+
+            if state == 'progress' and job.on_progress is not None:
+                job.on_progress(value)
+            elif state == 'done':
+                job.on_done(value)
+            elif state == 'error' and job.on_error is not None:
+                job.on_error(value)
+
+    def has_active_jobs(self):
+        return len(self.jobs) > 0
+
+    def cancel(self, key):
+        job = self.jobs.pop(key, None)
+        if job is not None:
+            job.cancel()
+
+    def cancel_all(self):
+        for key in list(self.jobs):
+            self.cancel(key)
+
+    def shutdown(self):
+        self.cancel_all()
+        self.root.after_cancel(self.poll_id)
+        self.executor.shutdown(wait=False, cancel_futures=True)
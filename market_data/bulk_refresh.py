@@ -0,0 +1,88 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+import time
+
+from market_data.background_fetcher import FetchCancelled
+
+
+MAX_CONCURRENT_REFRESHES = 4
+REQUESTS_PER_SECOND = 2.0
+BURST_SIZE = 4
+MAX_RETRIES = 3
+INITIAL_BACKOFF = 1.0
+
+
+class TokenBucket:
+    def __init__(self, rate=REQUESTS_PER_SECOND, capacity=BURST_SIZE, clock=time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.tokens = capacity
+        self.last_refill = clock()
+        self.lock = threading.Lock()
+
+    def refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+
+    def acquire(self, cancel_event):
+        while True:
+            with self.lock:
+                self.refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait_time = (1 - self.tokens) / self.rate
+
+            if cancel_event.wait(wait_time):
+                raise FetchCancelled()
+
+
+def refresh_with_retries(job, symbol, refresh_security, token_bucket, max_retries, initial_backoff):
+    for attempt in range(max_retries + 1):
+        job.raise_if_cancelled()
+        token_bucket.acquire(job.cancel_event)
+
+        try:
+            return refresh_security(symbol)
+        except Exception:
+            if attempt == max_retries:
+                raise
+
+        if job.cancel_event.wait(initial_backoff * 2 ** attempt):
+            raise FetchCancelled(symbol)
+
+
+def refresh_all(job,
+                security_list,
+                refresh_security,
+                max_workers=MAX_CONCURRENT_REFRESHES,
+                token_bucket=None,
+                max_retries=MAX_RETRIES,
+                initial_backoff=INITIAL_BACKOFF):
+    if token_bucket is None:
+        token_bucket = TokenBucket()
+
+    failed_securities = {}
+    refreshed_count = 0
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = {executor.submit(refresh_with_retries, job, symbol, refresh_security, token_bucket, max_retries, initial_backoff): symbol
+                   for symbol in security_list}
+
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except FetchCancelled:
+                raise
+            except Exception as e:
+                failed_securities[futures[future]] = e
+
+            refreshed_count += 1
+            job.report_progress(f'Refreshing {refreshed_count} / {len(security_list)} ...')
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return failed_securities
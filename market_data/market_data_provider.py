@@ -0,0 +1,7 @@
+from abc import ABC, abstractmethod
+
+
+class MarketDataProvider(ABC):
+    @abstractmethod
+    def history(self, symbol, interval='1d', start=None):
+        pass
@@ -0,0 +1,85 @@
+from datetime import date
+import os
+import time
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from market_data.market_data_provider import MarketDataProvider
+
+
+SYNTHETIC_FREQUENCIES = {
+    '1m': 'min',
+    '5m': '5min',
+    '1h': 'h',
+    '1d': 'B',
+    '1wk': 'W-MON',
+    '1mo': 'MS'
+}
+CHART_DATA_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume', 'Dividends', 'Stock Splits']
+
+
+def read_fixture(directory, symbol, interval):
+    filename = os.path.join(directory, symbol, f'{symbol}_{interval}')
+
+    if os.path.exists(filename + '.npz'):
+        with np.load(filename + '.npz', allow_pickle=False) as chart_columns:
+            dates = pd.DatetimeIndex(chart_columns['Date'].astype('datetime64[ns]'), name='Date')
+            return pd.DataFrame({column: chart_columns[column] for column in chart_columns.files if column != 'Date'},
+                                index=dates)
+
+    if os.path.exists(filename + '.csv'):
+        return pd.read_csv(filename + '.csv', index_col=0, parse_dates=True)
+
+    return None
+
+
+def generate_synthetic_history(symbol, length, interval='1d', seed=0, end=None):
+    random = np.random.default_rng([zlib.crc32(symbol.encode()), seed])
+    end = pd.Timestamp(end if end is not None else date.today())
+    dates = pd.date_range(end=end, periods=length, freq=SYNTHETIC_FREQUENCIES[interval], name='Date')
+
+    returns = random.normal(0.0003, 0.02, length)
+    close = 10 * np.exp(np.cumsum(returns))
+    open_ = np.concatenate(([close[0]], close[:-1])) * (1 + random.normal(0, 0.005, length))
+    high = np.maximum(open_, close) * (1 + np.abs(random.normal(0, 0.01, length)))
+    low = np.minimum(open_, close) * (1 - np.abs(random.normal(0, 0.01, length)))
+    volume = random.integers(100000, 10000000, length)
+
+    return pd.DataFrame({
+        'Open': open_,
+        'High': high,
+        'Low': low,
+        'Close': close,
+        'Volume': volume,
+        'Dividends': np.zeros(length),
+        'Stock Splits': np.zeros(length)
+    }, index=dates)
+
+
+class ReplayProvider(MarketDataProvider):
+    def __init__(self, directory='securities', synthetic_length=None, seed=0, latency=0.0):
+        self.directory = directory
+        self.synthetic_length = synthetic_length
+        self.seed = seed
+        self.latency = latency
+
+    def history(self, symbol, interval='1d', start=None):
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+        historical_data = None
+        if self.directory is not None:
+            historical_data = read_fixture(self.directory, symbol, interval)
+
+        if historical_data is None and self.synthetic_length is not None:
+            historical_data = generate_synthetic_history(symbol, self.synthetic_length, interval, self.seed)
+
+        if historical_data is None:
+            return pd.DataFrame(columns=CHART_DATA_COLUMNS, index=pd.DatetimeIndex([], name='Date'))
+
+        if start is not None:
+            historical_data = historical_data.loc[pd.Timestamp(start):]
+
+        return historical_data
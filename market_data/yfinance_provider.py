@@ -0,0 +1,13 @@
+from market_data.market_data_provider import MarketDataProvider
+
+
+class YFinanceProvider(MarketDataProvider):
+    def history(self, symbol, interval='1d', start=None):
+        import yfinance as yf
+
+        ticker = yf.Ticker(symbol)
+
+        if start is None:
+            return ticker.history(period='max', interval=interval)
+
+        return ticker.history(start=start, interval=interval)
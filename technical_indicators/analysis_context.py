@@ -0,0 +1,38 @@
+from functools import cached_property
+
+from technical_indicators import candlestick_patterns, on_balance_volume, peaks_and_lows
+from technical_indicators.rolling_statistics import RollingStatistics
+
+
+class AnalysisContext:
+    def __init__(self, chart_data, chart_settings):
+        self.chart_data = chart_data
+        self.chart_settings = chart_settings
+
+    @cached_property
+    def rolling_statistics(self):
+        return RollingStatistics(self.chart_data['Close'])
+
+    @cached_property
+    def peaks(self):
+        return peaks_and_lows.find_all_peaks(self.chart_data)
+
+    @cached_property
+    def best_peaks(self):
+        return peaks_and_lows.find_best_peaks(self.peaks, self.chart_settings)
+
+    @cached_property
+    def lows(self):
+        return peaks_and_lows.find_all_lows(self.chart_data)
+
+    @cached_property
+    def best_lows(self):
+        return peaks_and_lows.find_best_lows(self.lows, self.chart_settings)
+
+    @cached_property
+    def candlestick_signals(self):
+        return candlestick_patterns.find_candlestick_signals(self.chart_data)
+
+    @cached_property
+    def on_balance_volume(self):
+        return on_balance_volume.calculate_on_balance_volume(self.chart_data)
@@ -1,28 +1,35 @@
 import mplfinance as mpf
 
+from technical_indicators.rolling_statistics import get_rolling_statistics
 
-def find_bollinger_bands(chart_data, chart_settings):
+
+def find_bollinger_bands(chart_data, chart_settings, rolling_statistics=None):
     mav_for_bollinger_bands = chart_settings['mav_for_bollinger_bands']
+    rolling_statistics = get_rolling_statistics(chart_data, rolling_statistics)
 
-    mav = chart_data['Close'].rolling(window=mav_for_bollinger_bands).mean()
+    mav = rolling_statistics.mean(mav_for_bollinger_bands)
+    std = rolling_statistics.std(mav_for_bollinger_bands)
 
-    upper_band = mav + 2 * chart_data['Close'].rolling(window=mav_for_bollinger_bands).std()
-    lower_band = mav - 2 * chart_data['Close'].rolling(window=mav_for_bollinger_bands).std()
+    upper_band = mav + 2 * std
+    lower_band = mav - 2 * std
 
     return [upper_band, lower_band]
 
 
-def add_bollinger_bands(chart_data, chart_settings):
+def add_bollinger_bands(analysis_context):
+    chart_data = analysis_context.chart_data
+    chart_settings = analysis_context.chart_settings
     bollinger_bands_list = []
 
     if chart_settings['show_bollinger_bands']:
         if len(chart_data) > chart_settings['mav_for_bollinger_bands']:
-            upper_bollinger_band_plot = mpf.make_addplot(find_bollinger_bands(chart_data, chart_settings)[0],
+            upper_band, lower_band = find_bollinger_bands(chart_data, chart_settings, analysis_context.rolling_statistics)
+            upper_bollinger_band_plot = mpf.make_addplot(upper_band,
                                                          label='Upper Bollinger Band',
                                                          color='gold',
                                                          width=0.8)
             bollinger_bands_list.append(upper_bollinger_band_plot)
-            lower_bollinger_band_plot = mpf.make_addplot(find_bollinger_bands(chart_data, chart_settings)[1],
+            lower_bollinger_band_plot = mpf.make_addplot(lower_band,
                                                          label='Lower Bollinger Band',
                                                          color='lime',
                                                          width=0.8)
@@ -1,54 +1,103 @@
-import talib
-
 import mplfinance as mpf
+import numpy as np
+import pandas as pd
+
+
+CANDLESTICK_PATTERNS = [('CDLDOJI', 'Bullish Doji', 'Bearish Doji'),
+                        ('CDLENGULFING', 'Bullish Engulfing', 'Bearish Engulfing'),
+                        ('CDLEVENINGSTAR', 'Evening Star', 'Evening Star'),
+                        ('CDLHAMMER', 'Bullish Hammer', 'Bearish Hammer'),
+                        ('CDLHARAMI', 'Bullish Harami', 'Bearish Harami'),
+                        ('CDLMORNINGSTAR', 'Morning Star', 'Morning Star'),
+                        ('CDLSEPARATINGLINES', 'Bullish Separating Lines', 'Bearish Separating Lines'),
+                        ('CDLSHOOTINGSTAR', 'Bullish Shooting Star', 'Bearish Shooting Star'),
+                        ('CDLRISEFALL3METHODS', 'Rising Three Methods', 'Falling Three Methods')]
+SCAN_BARS = 5
+
+
+def get_price_arrays(chart_columns):
+    return [np.asarray(chart_columns[column], dtype=float) for column in ['Open', 'High', 'Low', 'Close']]
+
+
+def calculate_candlestick_signals(open_prices, high_prices, low_prices, close_prices):
+    import talib
+
+    signals = np.zeros((len(close_prices), len(CANDLESTICK_PATTERNS)), dtype=np.int8)
+
+    for i, (pattern, bullish_label, bearish_label) in enumerate(CANDLESTICK_PATTERNS):
+        talib_function = getattr(talib, pattern)
+        signals[:, i] = np.sign(talib_function(open_prices, high_prices, low_prices, close_prices))
+
+    return signals
+
+
+def find_candlestick_signals(chart_data):
+    signals = calculate_candlestick_signals(*get_price_arrays(chart_data))
+    patterns = [pattern for pattern, bullish_label, bearish_label in CANDLESTICK_PATTERNS]
 
+    return pd.DataFrame(signals, index=chart_data.index, columns=patterns)
 
-def find_candlestick_pattern(chart_data, talib_function, bullish_label, bearish_label):
-    bullish_candlestick = chart_data[talib_function(chart_data['Open'],
-                                                    chart_data['High'],
-                                                    chart_data['Low'],
-                                                    chart_data['Close']) > 0]
-    bearish_candlestick = chart_data[talib_function(chart_data['Open'],
-                                                    chart_data['High'],
-                                                    chart_data['Low'],
-                                                    chart_data['Close']) < 0]
 
-    bullish_candlestick_plot = None
-    bearish_candlestick_plot = None
+def find_candlestick_pattern(chart_data, signal, bullish_label, bearish_label):
+    candlestick_plots = []
 
-    if len(bullish_candlestick) > 0:
-        aligned_bullish_candlestick = bullish_candlestick.reindex(chart_data.index)
-        bullish_candlestick_plot = mpf.make_addplot(aligned_bullish_candlestick['Close'],
+    if (signal > 0).any():
+        bullish_candlestick_plot = mpf.make_addplot(chart_data['Close'].where(signal > 0),
                                                     scatter=True,
                                                     label=bullish_label)
+        candlestick_plots.append(bullish_candlestick_plot)
 
-    if len(bearish_candlestick) > 0:
-        aligned_bearish_candlestick = bearish_candlestick.reindex(chart_data.index)
-        bearish_candlestick_plot = mpf.make_addplot(aligned_bearish_candlestick['Close'],
+    if (signal < 0).any():
+        bearish_candlestick_plot = mpf.make_addplot(chart_data['Close'].where(signal < 0),
                                                     scatter=True,
                                                     label=bearish_label)
+        candlestick_plots.append(bearish_candlestick_plot)
 
-    return [plot for plot in [bullish_candlestick_plot, bearish_candlestick_plot] if plot is not None]
+    return candlestick_plots
 
 
-def add_candlestick_patterns(chart_data, chart_settings):
+def add_candlestick_patterns(analysis_context):
     candlestick_plots = []
 
-    if chart_settings['show_candlestick_patterns']:
-        candlestick_patterns = [(talib.CDLDOJI, 'Bullish Doji', 'Bearish Doji'),
-                                (talib.CDLENGULFING, 'Bullish Engulfing', 'Bearish Engulfing'),
-                                (talib.CDLEVENINGSTAR, 'Evening Star', 'Evening Star'),
-                                (talib.CDLHAMMER, 'Bullish Hammer', 'Bearish Hammer'),
-                                (talib.CDLHARAMI, 'Bullish Harami', 'Bearish Harami'),
-                                (talib.CDLMORNINGSTAR, 'Morning Star', 'Morning Star'),
-                                (talib.CDLSEPARATINGLINES, 'Bullish Separating Lines', 'Bearish Separating Lines'),
-                                (talib.CDLSHOOTINGSTAR, 'Bullish Shooting Star', 'Bearish Shooting Star'),
-                                (talib.CDLRISEFALL3METHODS, 'Rising Three Methods', 'Falling Three Methods')]
-
-        for candlestick_pattern, bullish_label, bearish_label in candlestick_patterns:
-            candlestick_plots.extend(find_candlestick_pattern(chart_data,
-                                                              candlestick_pattern,
+    if analysis_context.chart_settings['show_candlestick_patterns']:
+        for pattern, bullish_label, bearish_label in CANDLESTICK_PATTERNS:
+            candlestick_plots.extend(find_candlestick_pattern(analysis_context.chart_data,
+                                                              analysis_context.candlestick_signals[pattern],
                                                               bullish_label,
                                                               bearish_label))
 
     return candlestick_plots
+
+
+def scan_candlestick_patterns(chart_columns_list, bars=SCAN_BARS):
+    from talib import abstract
+
+    patterns = [pattern for pattern, bullish_label, bearish_label in CANDLESTICK_PATTERNS]
+    lookbacks = np.array([abstract.Function(pattern).lookback for pattern in patterns])
+
+    symbols, intervals, dates, history_positions, is_scanned, price_arrays = [], [], [], [], [], []
+    for (symbol, interval), chart_columns in chart_columns_list:
+        stop = len(chart_columns['Close'])
+        start = max(stop - bars - lookbacks.max(), 0)
+
+        symbols.extend([symbol] * (stop - start))
+        intervals.extend([interval] * (stop - start))
+        dates.append(chart_columns['Date'][start:stop])
+        history_positions.append(np.arange(start, stop))
+        is_scanned.append(np.arange(start, stop) >= stop - bars)
+        price_arrays.append([prices[start:stop] for prices in get_price_arrays(chart_columns)])
+
+    if len(symbols) == 0:
+        return pd.DataFrame(columns=patterns, dtype=np.int8)
+
+    history_positions = np.concatenate(history_positions)
+    is_scanned = np.concatenate(is_scanned)
+    open_prices, high_prices, low_prices, close_prices = [np.concatenate(prices) for prices in zip(*price_arrays)]
+
+    signals = calculate_candlestick_signals(open_prices, high_prices, low_prices, close_prices)
+    signals[history_positions[:, None] < lookbacks[None, :]] = 0
+
+    index = pd.MultiIndex.from_arrays([symbols, intervals, np.concatenate(dates).astype('datetime64[ns]')],
+                                      names=['Symbol', 'Interval', 'Date'])
+
+    return pd.DataFrame(signals[is_scanned], index=index[is_scanned], columns=patterns)
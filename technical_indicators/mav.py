@@ -1,19 +1,23 @@
 import mplfinance as mpf
 
+from technical_indicators.rolling_statistics import get_rolling_statistics
 
-def calculate_mav(chart_data, days):
-    mav = chart_data['Close'].rolling(window=days).mean()
+
+def calculate_mav(chart_data, days, rolling_statistics=None):
+    mav = get_rolling_statistics(chart_data, rolling_statistics).mean(days)
     return mav
 
 
-def add_mav(chart_data, chart_settings):
+def add_mav(analysis_context):
+    chart_data = analysis_context.chart_data
+    chart_settings = analysis_context.chart_settings
     mav_list = []
     colors = ['cyan', 'magenta', 'purple']
 
     for i in range(1, 4):
         if chart_settings['show_mav' + str(i)]:
             if len(chart_data) > chart_settings['mav' + str(i)]:
-                mav_plot = mpf.make_addplot(calculate_mav(chart_data, chart_settings['mav' + str(i)]),
+                mav_plot = mpf.make_addplot(calculate_mav(chart_data, chart_settings['mav' + str(i)], analysis_context.rolling_statistics),
                                             label=f'MAV {i}',
                                             color=colors[i-1],
                                             width=0.8)
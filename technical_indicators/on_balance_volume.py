@@ -1,25 +1,26 @@
 import mplfinance as mpf
+import numpy as np
+import pandas as pd
 
 
 def calculate_on_balance_volume(chart_data):
-    obv = [0]
+    close = chart_data['Close'].to_numpy(dtype=float)
+    volume = chart_data['Volume'].to_numpy(dtype=float)
 
-    for i in range(1, len(chart_data)):
-        if chart_data['Close'].iloc[i] > chart_data['Close'].iloc[i - 1]:
-            obv.append(obv[-1] + chart_data['Volume'].iloc[i])
-        elif chart_data['Close'].iloc[i] < chart_data['Close'].iloc[i - 1]:
-            obv.append(obv[-1] - chart_data['Volume'].iloc[i])
-        else:
-            obv.append(obv[-1])
+    direction = np.zeros(len(close))
+    direction[1:] = np.nan_to_num(np.sign(np.diff(close)))
 
-    return obv
+    signed_volume = np.where(direction != 0, direction * volume, 0)
+    obv = np.cumsum(signed_volume)
 
+    return pd.Series(obv, index=chart_data.index, name='On Balance Volume')
 
-def add_on_balance_volume(chart_data, chart_settings):
+
+def add_on_balance_volume(analysis_context):
     on_balance_volume_list = []
 
-    if chart_settings['show_on_balance_volume']:
-        on_balance_volume_plot = mpf.make_addplot(calculate_on_balance_volume(chart_data),
+    if analysis_context.chart_settings['show_on_balance_volume']:
+        on_balance_volume_plot = mpf.make_addplot(analysis_context.on_balance_volume,
                                                   label='On Balance Volume',
                                                   ylabel='OBV',
                                                   secondary_y=True,
@@ -4,6 +4,10 @@ import numpy as np
 import pandas as pd
 
 
+MAX_TRENDLINES = 10
+TRENDLINE_RANKING = 'recent'
+
+
 def find_all_peaks(chart_data):
     peaks = chart_data[(chart_data['Close'] > chart_data['Close'].shift(1)) &
                        (chart_data['Close'] > chart_data['Close'].shift(-1))]
@@ -11,25 +15,29 @@ def find_all_peaks(chart_data):
     return peaks
 
 
-def find_best_peaks(peaks, chart_settings):
-    selected_peaks = []
+def find_surrounding_extreme(extrema, significance, extreme):
+    window = f'{significance}D'
+    prices = extrema['Close']
 
-    significance = chart_settings['best_peaks_significance']
+    preceding = getattr(prices.rolling(window, closed='both'), extreme)()
 
-    for i in range(len(peaks)):
-        current_peak = peaks.iloc[i]
-        current_date = current_peak.name
-        current_price = current_peak['Close']
+    last_date = prices.index[-1]
+    mirrored_prices = pd.Series(prices.to_numpy()[::-1], index=last_date + (last_date - prices.index[::-1]))
+    following = getattr(mirrored_prices.rolling(window, closed='both'), extreme)().to_numpy()[::-1]
 
-        start_date = max(current_date - pd.DateOffset(days=significance), peaks.index[0])
-        end_date = min(current_date + pd.DateOffset(days=significance), peaks.index[-1])
+    if extreme == 'max':
+        return np.maximum(preceding.to_numpy(), following)
+    return np.minimum(preceding.to_numpy(), following)
 
-        peaks_within_range = peaks.loc[start_date:end_date]
 
-        if current_price == peaks_within_range['Close'].max():
-            selected_peaks.append(current_peak)
+def find_best_peaks(peaks, chart_settings):
+    if len(peaks) == 0:
+        return peaks
+
+    significance = chart_settings['best_peaks_significance']
+    surrounding_max = find_surrounding_extreme(peaks, significance, 'max')
 
-    return pd.DataFrame(selected_peaks)
+    return peaks[peaks['Close'].to_numpy() == surrounding_max]
 
 
 def find_all_lows(chart_data):
@@ -40,37 +48,24 @@ def find_all_lows(chart_data):
 
 
 def find_best_lows(lows, chart_settings):
-    selected_lows = []
+    if len(lows) == 0:
+        return lows
 
     significance = chart_settings['best_lows_significance']
+    surrounding_min = find_surrounding_extreme(lows, significance, 'min')
 
-    for i in range(len(lows)):
-        current_low = lows.iloc[i]
-        current_date = current_low.name
-        current_price = current_low['Close']
-
-        start_date = max(current_date - pd.DateOffset(days=significance), lows.index[0])
-        end_date = min(current_date + pd.DateOffset(days=significance), lows.index[-1])
+    return lows[lows['Close'].to_numpy() == surrounding_min]
 
-        lows_within_range = lows.loc[start_date:end_date]
 
-        if current_price == lows_within_range['Close'].min():
-            selected_lows.append(current_low)
-
-    return pd.DataFrame(selected_lows)
-
-
-def add_best_peaks_and_lows(chart_data, chart_settings):
+def add_best_peaks_and_lows(analysis_context):
+    chart_data = analysis_context.chart_data
     best_peaks_and_lows_list = []
 
-    if not chart_settings['show_best_peaks_and_lows']:
+    if not analysis_context.chart_settings['show_best_peaks_and_lows']:
         return best_peaks_and_lows_list
 
-    all_peaks = find_all_peaks(chart_data)
-    best_peaks = find_best_peaks(all_peaks, chart_settings)
-
-    all_lows = find_all_lows(chart_data)
-    best_lows = find_best_lows(all_lows, chart_settings)
+    best_peaks = analysis_context.best_peaks
+    best_lows = analysis_context.best_lows
 
     if len(best_peaks) > 0:
         aligned_best_peaks = best_peaks.reindex(chart_data.index)
@@ -80,7 +75,7 @@ def add_best_peaks_and_lows(chart_data, chart_settings):
                                            label='Peaks')
         best_peaks_and_lows_list.append(best_peaks_plot)
 
-    if len(find_best_lows(find_all_lows(chart_data), chart_settings)) > 0:
+    if len(best_lows) > 0:
         aligned_best_lows = best_lows.reindex(chart_data.index)
         best_lows_plot = mpf.make_addplot(aligned_best_lows['Close'],
                                           scatter=True,
@@ -91,71 +86,102 @@ def add_best_peaks_and_lows(chart_data, chart_settings):
     return best_peaks_and_lows_list
 
 
-def calculate_uptrend_line(best_peaks, best_lows):
-    uptrend_lines = []
+def find_trendline_candidates(outer_extrema, inner_extrema, is_ascending):
+    if len(outer_extrema) < 2 or len(inner_extrema) < 2:
+        return []
+
+    outer_dates = outer_extrema.index.to_numpy()
+    outer_closes = outer_extrema['Close'].to_numpy()
+    inner_dates = inner_extrema.index.to_numpy()
+    inner_closes = inner_extrema['Close'].to_numpy()
 
-    for i in range(1, len(best_peaks)):
-        peak1 = best_peaks.iloc[i-1]
-        peak2 = best_peaks.iloc[i]
+    next_inner = np.searchsorted(inner_dates, outer_dates[:-1], side='right')
+    is_candidate = (next_inner >= 1) & (next_inner < len(inner_dates))
+    next_inner = np.clip(next_inner, 1, len(inner_dates) - 1)
+    is_candidate &= inner_dates[next_inner] < outer_dates[1:]
 
-        for j in range(1, len(best_lows)):
-            low1 = best_lows.iloc[j-1]
-            low2 = best_lows.iloc[j]
+    outer_change = np.diff(outer_closes)
+    inner_change = inner_closes[next_inner] - inner_closes[next_inner - 1]
+    if is_ascending:
+        is_candidate &= (outer_change > 0) & (inner_change > 0)
+    else:
+        is_candidate &= (outer_change < 0) & (inner_change < 0)
 
-            is_price_ascending = peak1['Close'] < peak2['Close'] and low1['Close'] < low2['Close']
-            is_time_order_correct = low1.name < peak1.name < low2.name < peak2.name
+    candidates = []
+    for i in np.flatnonzero(is_candidate):
+        j = next_inner[i]
+        candidates.append([(inner_dates[j-1], inner_closes[j-1]),
+                           (outer_dates[i], outer_closes[i]),
+                           (inner_dates[j], inner_closes[j]),
+                           (outer_dates[i+1], outer_closes[i+1])])
 
-            if is_price_ascending and is_time_order_correct:
-                uptrend_lines.append([low1, peak1, low2, peak2])
+    return candidates
 
-    return uptrend_lines
 
+def get_trendline_strength(trendline):
+    close1 = trendline[0][1]
+    close2 = trendline[2][1]
+    return abs(np.log(close2 / close1))
 
-def calculate_downtrend_line(best_peaks, best_lows):
-    downtrend_lines = []
 
-    for i in range(1, len(best_lows)):
-        low1 = best_lows.iloc[i-1]
-        low2 = best_lows.iloc[i]
+def rank_trendlines(trendlines, max_trendlines=MAX_TRENDLINES, ranking=TRENDLINE_RANKING):
+    if max_trendlines is None or len(trendlines) <= max_trendlines:
+        return trendlines
+
+    if ranking == 'strongest':
+        strongest = sorted(range(len(trendlines)), key=lambda i: get_trendline_strength(trendlines[i]), reverse=True)
+        return [trendlines[i] for i in sorted(strongest[:max_trendlines])]
 
-        for j in range(len(best_peaks)):
-            peak1 = best_peaks.iloc[j-1]
-            peak2 = best_peaks.iloc[j]
+    return trendlines[-max_trendlines:]
 
-            is_price_descending = low1['Close'] > low2['Close'] and peak1['Close'] > peak2['Close']
-            is_time_order_correct = peak1.name < low1.name < peak2.name < low2.name
 
-            if is_price_descending and is_time_order_correct:
-                downtrend_lines.append([peak1, low1, peak2, low2])
+def calculate_uptrend_line(best_peaks, best_lows, max_trendlines=MAX_TRENDLINES, ranking=TRENDLINE_RANKING):
+    uptrend_lines = find_trendline_candidates(best_peaks, best_lows, True)
+    return rank_trendlines(uptrend_lines, max_trendlines, ranking)
 
-    return downtrend_lines
+
+def calculate_downtrend_line(best_peaks, best_lows, max_trendlines=MAX_TRENDLINES, ranking=TRENDLINE_RANKING):
+    downtrend_lines = find_trendline_candidates(best_lows, best_peaks, False)
+    return rank_trendlines(downtrend_lines, max_trendlines, ranking)
+
+
+def count_bars_between(chart_data, date1, date2):
+    return chart_data.index.searchsorted(date2, side='right') - chart_data.index.searchsorted(date1, side='left')
+
+
+def accumulate_line(start_value, step, date1, chart_data):
+    line_data = np.full(len(chart_data), math.nan)
+
+    start = chart_data.index.searchsorted(date1, side='left')
+    if start < len(chart_data):
+        steps = np.full(len(chart_data) - start, step)
+        steps[0] = start_value
+        line_data[start:] = np.cumsum(steps)
+
+    return line_data
+
+
+def clip_line(line_data, trend, chart_data):
+    if trend == 'Uptrend':
+        line_data[line_data > chart_data['Close'].max()] = math.nan
+    if trend == 'Downtrend':
+        line_data[line_data < chart_data['Close'].min()] = math.nan
+
+    return line_data
 
 
 def draw_line_between_two_points(point1, point2, line_color, trend, chart_data):
-    date1 = point1.name
-    date2 = point2.name
-    close1 = point1['Close']
-    close2 = point2['Close']
+    date1, close1 = point1
+    date2, close2 = point2
     dif_close = abs(close2-close1)
-    dif_day = sum((date1 <= chart_data.iloc[day].name <= date2) for day in range(len(chart_data)))
+    dif_day = count_bars_between(chart_data, date1, date2)
     dif_close_per_day = dif_close / dif_day
 
-    line_data = []
-    price = close1
+    if trend == 'Downtrend':
+        dif_close_per_day = -dif_close_per_day
 
-    for day in range(len(chart_data)):
-        is_before_date1 = chart_data.iloc[day].name < date1
-        is_maximum_exceeded = trend == 'Uptrend' and price > chart_data['Close'].max()
-        is_minimum_exceeded = trend == 'Downtrend' and price < chart_data['Close'].min()
-
-        if is_before_date1 or is_maximum_exceeded or is_minimum_exceeded:
-            line_data.append(math.nan)
-        else:
-            line_data.append(price)
-            if trend == 'Uptrend' and price <= chart_data['Close'].max():
-                price = price + dif_close_per_day
-            if trend == 'Downtrend' and price >= chart_data['Close'].min():
-                price = price - dif_close_per_day
+    line_data = accumulate_line(close1, dif_close_per_day, date1, chart_data)
+    line_data = clip_line(line_data, trend, chart_data)
 
     trend_line_plot = mpf.make_addplot(line_data, color=line_color, label=trend)
 
@@ -163,46 +189,36 @@ def draw_line_between_two_points(point1, point2, line_color, trend, chart_data):
 
 
 def draw_logarithmic_line_between_two_points(point1, point2, line_color, trend, chart_data):
-    date1 = point1.name
-    date2 = point2.name
-    close1 = point1['Close']
-    close2 = point2['Close']
+    date1, close1 = point1
+    date2, close2 = point2
     log_close1 = np.log(close1)
     log_close2 = np.log(close2)
     dif_log_close = abs(log_close2-log_close1)
-    dif_day = sum((date1 <= chart_data.iloc[day].name <= date2) for day in range(len(chart_data)))
+    dif_day = count_bars_between(chart_data, date1, date2)
     dif_log_close_per_day = dif_log_close / dif_day
 
-    line_data = []
-    log_price = log_close1
+    if trend == 'Downtrend':
+        dif_log_close_per_day = -dif_log_close_per_day
 
-    for day in range(len(chart_data)):
-        is_before_date1 = chart_data.iloc[day].name < date1
-        is_maximum_exceeded = trend == 'Uptrend' and np.exp(log_price) > chart_data['Close'].max()
-        is_minimum_exceeded = trend == 'Downtrend' and np.exp(log_price) < chart_data['Close'].min()
-
-        if is_before_date1 or is_maximum_exceeded or is_minimum_exceeded:
-            line_data.append(math.nan)
-        else:
-            line_data.append(np.exp(log_price))
-            if trend == 'Uptrend' and np.exp(log_price) <= chart_data['Close'].max():
-                log_price = log_price + dif_log_close_per_day
-            if trend == 'Downtrend' and np.exp(log_price) >= chart_data['Close'].min():
-                log_price = log_price - dif_log_close_per_day
+    line_data = np.exp(accumulate_line(log_close1, dif_log_close_per_day, date1, chart_data))
+    line_data = clip_line(line_data, trend, chart_data)
 
     trend_line_plot = mpf.make_addplot(line_data, color=line_color, label=trend)
 
     return trend_line_plot
 
 
-def add_trendline(best_peaks, best_lows, chart_data, chart_settings):
-    uptrend_lines = calculate_uptrend_line(best_peaks, best_lows)
-    downtrend_lines = calculate_downtrend_line(best_peaks, best_lows)
+def add_trendline(analysis_context):
+    chart_data = analysis_context.chart_data
+    chart_settings = analysis_context.chart_settings
     trendlines = []
 
     if not chart_settings['show_best_peaks_and_lows']:
         return trendlines
 
+    uptrend_lines = calculate_uptrend_line(analysis_context.best_peaks, analysis_context.best_lows)
+    downtrend_lines = calculate_downtrend_line(analysis_context.best_peaks, analysis_context.best_lows)
+
     for i in uptrend_lines:
         if not chart_settings['show_logarithmic_scale']:
             trendlines.append(draw_line_between_two_points(i[0], i[2], 'green', 'Uptrend', chart_data))
@@ -218,19 +234,20 @@ def add_trendline(best_peaks, best_lows, chart_data, chart_settings):
     return trendlines
 
 
-def add_horizontal_lines(chart_data, chart_settings):
+def add_horizontal_lines(analysis_context):
+    chart_settings = analysis_context.chart_settings
     horizontal_lines = []
 
     if chart_settings['show_best_peaks_and_lows'] and not chart_settings['show_nontrading']:
         hlines = []
         colors = []
 
-        best_lows = find_best_lows(find_all_lows(chart_data), chart_settings)
+        best_lows = analysis_context.best_lows
         if len(best_lows) != 0:
             hlines.append(best_lows['Close'].iloc[-1])
             colors.append('r')
 
-        best_peaks = find_best_peaks(find_all_peaks(chart_data), chart_settings)
+        best_peaks = analysis_context.best_peaks
         if len(best_peaks) != 0:
             hlines.append(best_peaks['Close'].iloc[-1])
             colors.append('g')
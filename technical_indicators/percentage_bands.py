@@ -1,11 +1,13 @@
 import mplfinance as mpf
 
+from technical_indicators.rolling_statistics import get_rolling_statistics
 
-def find_percentage_bands(chart_data, chart_settings):
+
+def find_percentage_bands(chart_data, chart_settings, rolling_statistics=None):
     mav = chart_settings['mav_for_percentage_bands']
     percentage = chart_settings['percentage_for_percentage_bands']
 
-    mav = chart_data['Close'].rolling(window=mav).mean()
+    mav = get_rolling_statistics(chart_data, rolling_statistics).mean(mav)
 
     upper_band = mav * (1 + percentage / 100)
     lower_band = mav * (1 - percentage / 100)
@@ -13,18 +15,21 @@ def find_percentage_bands(chart_data, chart_settings):
     return upper_band, lower_band
 
 
-def add_percentage_bands(chart_data, chart_settings):
+def add_percentage_bands(analysis_context):
+    chart_data = analysis_context.chart_data
+    chart_settings = analysis_context.chart_settings
     percentage_bands_list = []
 
     if chart_settings['show_percentage_bands']:
         if len(chart_data) > chart_settings['mav_for_percentage_bands']:
-            upper_percentage_band_plot = mpf.make_addplot(find_percentage_bands(chart_data, chart_settings)[0],
+            upper_band, lower_band = find_percentage_bands(chart_data, chart_settings, analysis_context.rolling_statistics)
+            upper_percentage_band_plot = mpf.make_addplot(upper_band,
                                                           label='Upper Percentage Band',
                                                           color='olive',
                                                           width=0.8)
             percentage_bands_list.append(upper_percentage_band_plot)
 
-            lower_percentage_band_plot = mpf.make_addplot(find_percentage_bands(chart_data, chart_settings)[1],
+            lower_percentage_band_plot = mpf.make_addplot(lower_band,
                                                           label='Lower Percentage Band',
                                                           color='orange',
                                                           width=0.8)
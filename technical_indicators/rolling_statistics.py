@@ -0,0 +1,22 @@
+class RollingStatistics:
+    def __init__(self, series):
+        self.series = series
+        self.statistics = {}
+
+    def get(self, window, statistic):
+        key = (window, statistic)
+        if key not in self.statistics:
+            self.statistics[key] = getattr(self.series.rolling(window=window), statistic)()
+        return self.statistics[key]
+
+    def mean(self, window):
+        return self.get(window, 'mean')
+
+    def std(self, window):
+        return self.get(window, 'std')
+
+
+def get_rolling_statistics(chart_data, rolling_statistics=None):
+    if rolling_statistics is None:
+        return RollingStatistics(chart_data['Close'])
+    return rolling_statistics
@@ -0,0 +1,105 @@
+import os
+import queue
+import threading
+import time
+
+import pytest
+
+from file_handler import csv_handler
+from market_data import MarketDataProvider, TokenBucket, generate_synthetic_history, refresh_all
+from market_data.background_fetcher import FetchJob
+
+
+class StandInProvider(MarketDataProvider):
+    def __init__(self, failures=None):
+        self.failures = dict(failures or {})
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def history(self, symbol, interval='1d', start=None):
+        with self.lock:
+            self.calls.append((symbol, start, time.monotonic()))
+            if self.failures.get(symbol, 0) > 0:
+                self.failures[symbol] -= 1
+                raise ConnectionError(f'{symbol} unavailable')
+
+        historical_data = generate_synthetic_history(symbol, 300, interval, end='2024-06-28')
+        if start is not None:
+            historical_data = historical_data.loc[start:]
+        return historical_data
+
+
+def create_job():
+    return FetchJob('refresh all', None, None, None, None, queue.Queue())
+
+
+def store_securities(symbols):
+    for symbol in symbols:
+        csv_handler.write_chart_data(symbol, '1d', generate_synthetic_history(symbol, 300, end='2024-06-28').iloc[:-1])
+
+
+def refresh_security(provider):
+    return lambda symbol: csv_handler.update_chart_data(symbol, provider, '1d')
+
+
+@pytest.fixture(autouse=True)
+def securities_directory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs('securities')
+
+
+def test_refresh_all_appends_new_bars():
+    symbols = ['AAA', 'BBB', 'CCC']
+    store_securities(symbols)
+    provider = StandInProvider()
+
+    failed_securities = refresh_all(create_job(), symbols, refresh_security(provider))
+
+    assert failed_securities == {}
+    assert all(start is not None for symbol, start, called_at in provider.calls)
+    for symbol in symbols:
+        assert csv_handler.read_chart_metadata(symbol, '1d')['last_date'] == '2024-06-28'
+
+
+def test_refresh_all_is_throttled():
+    symbols = [f'S{i}' for i in range(6)]
+    store_securities(symbols)
+    provider = StandInProvider()
+
+    started_at = time.monotonic()
+    refresh_all(create_job(), symbols, refresh_security(provider), token_bucket=TokenBucket(rate=20.0, capacity=1))
+
+    assert time.monotonic() - started_at >= (len(symbols) - 1) / 20.0 * 0.9
+
+
+def test_refresh_all_retries_failed_requests():
+    store_securities(['AAA'])
+    provider = StandInProvider(failures={'AAA': 2})
+
+    failed_securities = refresh_all(create_job(), ['AAA'], refresh_security(provider), max_retries=3, initial_backoff=0.01)
+
+    assert failed_securities == {}
+    assert len(provider.calls) == 3
+
+
+def test_refresh_all_reports_failed_securities():
+    store_securities(['AAA', 'BBB'])
+    provider = StandInProvider(failures={'BBB': 10})
+
+    failed_securities = refresh_all(create_job(), ['AAA', 'BBB'], refresh_security(provider), max_retries=2, initial_backoff=0.01)
+
+    assert list(failed_securities) == ['BBB']
+    assert isinstance(failed_securities['BBB'], ConnectionError)
+    assert len([symbol for symbol, start, called_at in provider.calls if symbol == 'BBB']) == 3
+
+
+def test_refresh_never_downloads_removed_security():
+    store_securities(['AAA'])
+    csv_handler.remove_chart_data('AAA')
+    provider = StandInProvider()
+
+    failed_securities = refresh_all(create_job(), ['AAA'], refresh_security(provider), max_retries=0)
+
+    assert isinstance(failed_securities['AAA'], FileNotFoundError)
+    assert provider.calls == []
+    assert not os.path.exists(os.path.join('securities', 'AAA'))
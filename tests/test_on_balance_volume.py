@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from market_data import generate_synthetic_history
+from technical_indicators.on_balance_volume import calculate_on_balance_volume
+
+
+def calculate_on_balance_volume_loop(chart_data):
+    obv = [0]
+
+    for i in range(1, len(chart_data)):
+        if chart_data['Close'].iloc[i] > chart_data['Close'].iloc[i - 1]:
+            obv.append(obv[-1] + chart_data['Volume'].iloc[i])
+        elif chart_data['Close'].iloc[i] < chart_data['Close'].iloc[i - 1]:
+            obv.append(obv[-1] - chart_data['Volume'].iloc[i])
+        else:
+            obv.append(obv[-1])
+
+    return obv
+
+
+def create_chart_data(close, volume):
+    dates = pd.date_range('2024-01-01', periods=len(close), freq='B', name='Date')
+    return pd.DataFrame({'Close': close, 'Volume': volume}, index=dates)
+
+
+def assert_matches_loop(chart_data):
+    on_balance_volume = calculate_on_balance_volume(chart_data)
+
+    assert on_balance_volume.index.equals(chart_data.index)
+    np.testing.assert_allclose(on_balance_volume.to_numpy(), calculate_on_balance_volume_loop(chart_data))
+
+
+def test_matches_loop_on_synthetic_history():
+    assert_matches_loop(generate_synthetic_history('AAA', 2000, end='2024-06-28'))
+
+
+def test_matches_loop_with_flat_closes():
+    chart_data = generate_synthetic_history('AAA', 500, end='2024-06-28')
+    chart_data['Close'] = chart_data['Close'].round(0)
+
+    assert (chart_data['Close'].diff() == 0).sum() > 100
+    assert_matches_loop(chart_data)
+
+
+def test_matches_loop_on_single_bar():
+    assert_matches_loop(create_chart_data([10.0], [1000]))
+
+
+@pytest.mark.parametrize('close', [
+    [10.0, 10.0, 10.0, 11.0, 12.0],
+    [10.0, 11.0, 11.0, 10.0, 12.0],
+    [10.0, 11.0, 12.0, 11.0, 10.0]
+])
+def test_matches_loop_with_nan_volume(close):
+    assert_matches_loop(create_chart_data(close, [np.nan, 200.0, np.nan, 400.0, 500.0]))
@@ -0,0 +1,171 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from market_data import generate_synthetic_history
+from technical_indicators import peaks_and_lows
+
+
+def find_best_extrema_loop(extrema, significance, extreme):
+    selected_extrema = []
+
+    for i in range(len(extrema)):
+        current_extremum = extrema.iloc[i]
+        current_date = current_extremum.name
+        current_price = current_extremum['Close']
+
+        start_date = max(current_date - pd.DateOffset(days=significance), extrema.index[0])
+        end_date = min(current_date + pd.DateOffset(days=significance), extrema.index[-1])
+
+        extrema_within_range = extrema.loc[start_date:end_date]
+
+        if current_price == getattr(extrema_within_range['Close'], extreme)():
+            selected_extrema.append(current_extremum)
+
+    return pd.DataFrame(selected_extrema)
+
+
+def create_chart_settings(significance):
+    return {'best_peaks_significance': significance, 'best_lows_significance': significance}
+
+
+@pytest.mark.parametrize('symbol, interval, significance', [
+    ('AAA', '1d', 5),
+    ('BBB', '1d', 30),
+    ('CCC', '1d', 365),
+    ('AAA', '1wk', 60),
+    ('BBB', '1mo', 400)
+])
+def test_best_peaks_and_lows_match_loop(symbol, interval, significance):
+    chart_data = generate_synthetic_history(symbol, 1500, interval, end='2024-06-28')
+    chart_data['Close'] = chart_data['Close'].round(1)
+    chart_settings = create_chart_settings(significance)
+
+    peaks = peaks_and_lows.find_all_peaks(chart_data)
+    best_peaks = peaks_and_lows.find_best_peaks(peaks, chart_settings)
+    expected_best_peaks = find_best_extrema_loop(peaks, significance, 'max')
+    assert best_peaks.index.equals(expected_best_peaks.index)
+    assert best_peaks['Close'].equals(expected_best_peaks['Close'])
+
+    lows = peaks_and_lows.find_all_lows(chart_data)
+    best_lows = peaks_and_lows.find_best_lows(lows, chart_settings)
+    expected_best_lows = find_best_extrema_loop(lows, significance, 'min')
+    assert best_lows.index.equals(expected_best_lows.index)
+    assert best_lows['Close'].equals(expected_best_lows['Close'])
+
+
+def test_best_peaks_of_single_peak():
+    chart_data = generate_synthetic_history('AAA', 1500, end='2024-06-28')
+    peaks = peaks_and_lows.find_all_peaks(chart_data).iloc[:1]
+
+    assert peaks_and_lows.find_best_peaks(peaks, create_chart_settings(30)).equals(peaks)
+
+
+def draw_line_loop(point1, point2, trend, chart_data, is_logarithmic):
+    date1, close1 = point1
+    date2, close2 = point2
+    transform, inverse = (np.log, np.exp) if is_logarithmic else (lambda price: price, lambda price: price)
+    dif_close = abs(transform(close2) - transform(close1))
+    dif_day = sum((date1 <= chart_data.iloc[day].name <= date2) for day in range(len(chart_data)))
+    dif_close_per_day = dif_close / dif_day
+
+    line_data = []
+    price = transform(close1)
+
+    for day in range(len(chart_data)):
+        is_before_date1 = chart_data.iloc[day].name < date1
+        is_maximum_exceeded = trend == 'Uptrend' and inverse(price) > chart_data['Close'].max()
+        is_minimum_exceeded = trend == 'Downtrend' and inverse(price) < chart_data['Close'].min()
+
+        if is_before_date1 or is_maximum_exceeded or is_minimum_exceeded:
+            line_data.append(math.nan)
+        else:
+            line_data.append(inverse(price))
+            if trend == 'Uptrend' and inverse(price) <= chart_data['Close'].max():
+                price = price + dif_close_per_day
+            if trend == 'Downtrend' and inverse(price) >= chart_data['Close'].min():
+                price = price - dif_close_per_day
+
+    return line_data
+
+
+def find_best_peaks_and_lows(chart_data, significance):
+    chart_settings = create_chart_settings(significance)
+    best_peaks = peaks_and_lows.find_best_peaks(peaks_and_lows.find_all_peaks(chart_data), chart_settings)
+    best_lows = peaks_and_lows.find_best_lows(peaks_and_lows.find_all_lows(chart_data), chart_settings)
+    return best_peaks, best_lows
+
+
+@pytest.mark.parametrize('is_logarithmic', [False, True])
+def test_trendlines_match_loop(is_logarithmic):
+    chart_data = generate_synthetic_history('AAA', 600, end='2024-06-28')
+    best_peaks, best_lows = find_best_peaks_and_lows(chart_data, 20)
+    draw_line = peaks_and_lows.draw_logarithmic_line_between_two_points if is_logarithmic else \
+        peaks_and_lows.draw_line_between_two_points
+
+    trendlines = [(trendline, 'Uptrend') for trendline in peaks_and_lows.calculate_uptrend_line(best_peaks, best_lows, None)] + \
+        [(trendline, 'Downtrend') for trendline in peaks_and_lows.calculate_downtrend_line(best_peaks, best_lows, None)]
+    assert {trend for trendline, trend in trendlines} == {'Uptrend', 'Downtrend'}
+
+    for trendline, trend in trendlines:
+        line_data = draw_line(trendline[0], trendline[2], 'grey', trend, chart_data)['data']
+        expected_line_data = draw_line_loop(trendline[0], trendline[2], trend, chart_data, is_logarithmic)
+        np.testing.assert_allclose(line_data, expected_line_data)
+
+
+def find_trendline_candidates_loop(outer_extrema, inner_extrema, is_ascending):
+    trendlines = []
+
+    for i in range(1, len(outer_extrema)):
+        outer1 = outer_extrema.iloc[i-1]
+        outer2 = outer_extrema.iloc[i]
+
+        for j in range(1, len(inner_extrema)):
+            inner1 = inner_extrema.iloc[j-1]
+            inner2 = inner_extrema.iloc[j]
+
+            if is_ascending:
+                is_price_trending = outer1['Close'] < outer2['Close'] and inner1['Close'] < inner2['Close']
+            else:
+                is_price_trending = outer1['Close'] > outer2['Close'] and inner1['Close'] > inner2['Close']
+            is_time_order_correct = inner1.name < outer1.name < inner2.name < outer2.name
+
+            if is_price_trending and is_time_order_correct:
+                trendlines.append([(point.name, point['Close']) for point in [inner1, outer1, inner2, outer2]])
+
+    return trendlines
+
+
+def normalize_trendlines(trendlines):
+    return [[(pd.Timestamp(date), close) for date, close in trendline] for trendline in trendlines]
+
+
+@pytest.mark.parametrize('symbol, significance', [('AAA', 5), ('BBB', 20), ('CCC', 90)])
+def test_trendline_candidates_match_loop(symbol, significance):
+    chart_data = generate_synthetic_history(symbol, 600, end='2024-06-28')
+    best_peaks, best_lows = find_best_peaks_and_lows(chart_data, significance)
+
+    uptrend_lines = peaks_and_lows.calculate_uptrend_line(best_peaks, best_lows, None)
+    assert len(uptrend_lines) > 0
+    assert normalize_trendlines(uptrend_lines) == find_trendline_candidates_loop(best_peaks, best_lows, True)
+
+    downtrend_lines = peaks_and_lows.calculate_downtrend_line(best_peaks, best_lows, None)
+    assert len(downtrend_lines) > 0
+    assert normalize_trendlines(downtrend_lines) == find_trendline_candidates_loop(best_lows, best_peaks, False)
+
+
+def test_trendlines_are_capped():
+    chart_data = generate_synthetic_history('AAA', 1500, end='2024-06-28')
+    best_peaks, best_lows = find_best_peaks_and_lows(chart_data, 5)
+    uptrend_lines = peaks_and_lows.calculate_uptrend_line(best_peaks, best_lows, None)
+    assert len(uptrend_lines) > 3
+
+    recent_lines = peaks_and_lows.calculate_uptrend_line(best_peaks, best_lows, 3, 'recent')
+    assert normalize_trendlines(recent_lines) == normalize_trendlines(uptrend_lines[-3:])
+
+    strongest_lines = peaks_and_lows.calculate_uptrend_line(best_peaks, best_lows, 3, 'strongest')
+    strengths = sorted((peaks_and_lows.get_trendline_strength(trendline) for trendline in uptrend_lines), reverse=True)
+    assert sorted(peaks_and_lows.get_trendline_strength(trendline) for trendline in strongest_lines) == sorted(strengths[:3])
+    assert [trendline[0][0] for trendline in strongest_lines] == sorted(trendline[0][0] for trendline in strongest_lines)
@@ -0,0 +1,44 @@
+import os
+
+import numpy as np
+import pytest
+
+from file_handler import csv_handler
+from market_data import MarketDataProvider, ReplayProvider, generate_synthetic_history
+
+
+@pytest.fixture(autouse=True)
+def securities_directory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs('securities')
+
+
+def test_market_data_provider_is_abstract():
+    with pytest.raises(TypeError):
+        MarketDataProvider()
+
+
+def test_synthetic_history_is_deterministic():
+    provider = ReplayProvider(directory=None, synthetic_length=500)
+
+    historical_data = provider.history('AAA')
+
+    assert len(historical_data) == 500
+    assert historical_data.equals(provider.history('AAA'))
+    assert not historical_data['Close'].equals(provider.history('BBB')['Close'])
+    assert provider.history('AAA', start=historical_data.index[-5]).equals(historical_data.iloc[-5:])
+
+
+def test_refresh_from_replayed_fixtures():
+    fixture_data = generate_synthetic_history('AAA', 300, end='2024-06-28')
+    os.makedirs(os.path.join('fixtures', 'AAA'))
+    fixture_data.to_csv(os.path.join('fixtures', 'AAA', 'AAA_1d.csv'))
+    provider = ReplayProvider(directory='fixtures')
+
+    csv_handler.write_chart_data('AAA', '1d', provider.history('AAA').iloc[:-3])
+    csv_handler.update_chart_data('AAA', provider, '1d')
+
+    chart_columns = csv_handler.read_chart_columns('AAA', '1d')
+    assert len(chart_columns['Date']) == len(fixture_data)
+    np.testing.assert_allclose(chart_columns['Close'], fixture_data['Close'].to_numpy())
+    assert csv_handler.read_chart_metadata('AAA', '1d')['last_date'] == '2024-06-28'
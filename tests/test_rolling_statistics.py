@@ -0,0 +1,56 @@
+import pandas as pd
+
+from market_data import generate_synthetic_history
+from technical_indicators.bollinger_bands import find_bollinger_bands
+from technical_indicators.mav import calculate_mav
+from technical_indicators.percentage_bands import find_percentage_bands
+from technical_indicators.rolling_statistics import RollingStatistics
+
+
+CHART_SETTINGS = {
+    'mav_for_bollinger_bands': 20,
+    'mav_for_percentage_bands': 20,
+    'percentage_for_percentage_bands': 5
+}
+
+
+def create_chart_data():
+    return generate_synthetic_history('AAA', 500, end='2024-06-28')
+
+
+def test_indicators_match_direct_rolling_windows():
+    chart_data = create_chart_data()
+    rolling_statistics = RollingStatistics(chart_data['Close'])
+    close = chart_data['Close']
+
+    for days in [5, 20, 50]:
+        pd.testing.assert_series_equal(calculate_mav(chart_data, days, rolling_statistics), close.rolling(window=days).mean())
+
+    mav = close.rolling(window=20).mean()
+    std = close.rolling(window=20).std()
+
+    upper_band, lower_band = find_bollinger_bands(chart_data, CHART_SETTINGS, rolling_statistics)
+    pd.testing.assert_series_equal(upper_band, mav + 2 * std)
+    pd.testing.assert_series_equal(lower_band, mav - 2 * std)
+
+    upper_band, lower_band = find_percentage_bands(chart_data, CHART_SETTINGS, rolling_statistics)
+    pd.testing.assert_series_equal(upper_band, mav * 1.05)
+    pd.testing.assert_series_equal(lower_band, mav * 0.95)
+
+
+def test_indicators_share_rolling_windows():
+    chart_data = create_chart_data()
+    rolling_statistics = RollingStatistics(chart_data['Close'])
+
+    mav = calculate_mav(chart_data, 20, rolling_statistics)
+    find_bollinger_bands(chart_data, CHART_SETTINGS, rolling_statistics)
+    find_percentage_bands(chart_data, CHART_SETTINGS, rolling_statistics)
+
+    assert sorted(rolling_statistics.statistics) == [(20, 'mean'), (20, 'std')]
+    assert rolling_statistics.mean(20) is mav
+
+
+def test_indicators_without_shared_statistics():
+    chart_data = create_chart_data()
+
+    pd.testing.assert_series_equal(calculate_mav(chart_data, 20), chart_data['Close'].rolling(window=20).mean())
@@ -1,6 +1,14 @@
-from .chart import Chart
 from .chart_display_settings import ChartDisplaySettings
 from .security_finder import SecurityFinder
 from .security_portfolio_manager import SecurityPortfolioManager
+from .settings_scheduler import SettingsScheduler
 from .technical_indicators_settings_left import TechnicalIndicatorsSettingsLeft
 from .technical_indicators_settings_right import TechnicalIndicatorsSettingsRight
+from .ui_state import UIState
+
+
+def __getattr__(name):
+    if name == 'Chart':
+        from .chart import Chart
+        return Chart
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -1,6 +1,8 @@
 import math
+import matplotlib.dates as mdates
 import matplotlib.pyplot as plt
 import mplfinance as mpf
+import numpy as np
 import tkinter as tk
 
 from datetime import date, timedelta
@@ -13,7 +15,8 @@ from technical_indicators import (bollinger_bands,
                                   on_balance_volume,
                                   peaks_and_lows,
                                   percentage_bands)
-from file_handler import csv_handler, txt_handler
+from technical_indicators.analysis_context import AnalysisContext
+from file_handler import csv_handler, metadata_store
 
 
 TIME_PERIODS = {
@@ -27,17 +30,23 @@ TIME_PERIODS = {
 }
 
 
-def configure_legend(ax, chart_settings):
+def configure_scale(ax, chart_settings):
     if chart_settings['show_logarithmic_scale']:
         ax[0].set_yscale('log')
         ax[0].yaxis.set_major_formatter(ScalarFormatter())
         ax[0].yaxis.set_minor_formatter(ScalarFormatter())
+    elif ax[0].get_yscale() != 'linear':
+        ax[0].set_yscale('linear')
 
-    if ax[0].get_legend() is not None:
-        ax[0].legend(loc='upper left')
 
-    if ax[1].get_legend() is not None:
-        ax[1].legend(loc='lower left')
+def configure_legend(ax):
+    for axis, location in [(ax[0], 'upper left'), (ax[1], 'lower left')]:
+        labels = [artist.get_label() for artist in [*axis.lines, *axis.collections]]
+        has_labels = any(label and not label.startswith('_') for label in labels)
+        if has_labels:
+            axis.legend(loc=location)
+        elif axis.get_legend() is not None:
+            axis.get_legend().remove()
 
 
 def get_start_date(chart_settings):
@@ -47,28 +56,79 @@ def get_start_date(chart_settings):
     return date.today() - delta
 
 
-def add_plots(chart_data, chart_settings):
+def add_plots(analysis_context, preview=False):
     add_plot = []
 
-    peaks = peaks_and_lows.find_all_peaks(chart_data)
-    best_peaks = peaks_and_lows.find_best_peaks(peaks, chart_settings)
-    lows = peaks_and_lows.find_all_lows(chart_data)
-    best_lows = peaks_and_lows.find_best_lows(lows, chart_settings)
-
-    add_plot.extend(bollinger_bands.add_bollinger_bands(chart_data, chart_settings))
-    add_plot.extend(candlestick_patterns.add_candlestick_patterns(chart_data, chart_settings))
-    add_plot.extend(mav.add_mav(chart_data, chart_settings))
-    add_plot.extend(on_balance_volume.add_on_balance_volume(chart_data, chart_settings))
-    add_plot.extend(peaks_and_lows.add_best_peaks_and_lows(chart_data, chart_settings))
-    add_plot.extend(peaks_and_lows.add_trendline(best_peaks, best_lows, chart_data, chart_settings))
-    add_plot.extend(percentage_bands.add_percentage_bands(chart_data, chart_settings))
+    add_plot.extend(bollinger_bands.add_bollinger_bands(analysis_context))
+    add_plot.extend(candlestick_patterns.add_candlestick_patterns(analysis_context))
+    add_plot.extend(mav.add_mav(analysis_context))
+    add_plot.extend(on_balance_volume.add_on_balance_volume(analysis_context))
+    add_plot.extend(peaks_and_lows.add_best_peaks_and_lows(analysis_context))
+    if not preview:
+        add_plot.extend(peaks_and_lows.add_trendline(analysis_context))
+    add_plot.extend(percentage_bands.add_percentage_bands(analysis_context))
 
     return add_plot
 
 
-def create_chart(chart_data, chart_settings):
-    plt.close()
+def get_base_key(chart_data, chart_settings):
+    return (chart_settings['symbol'],
+            chart_settings['interval'],
+            chart_settings['chart_type'],
+            chart_settings['show_volume'],
+            chart_settings['show_nontrading'],
+            chart_settings['box_size'] if chart_settings['chart_type'] == 'pnf' else None,
+            len(chart_data),
+            chart_data.index[0],
+            chart_data.index[-1],
+            float(chart_data['Close'].sum()))
+
+
+def get_xvalues(chart_data, chart_settings):
+    if chart_settings['show_nontrading']:
+        return mdates.date2num(chart_data.index.to_numpy())
+    return np.arange(len(chart_data))
+
+
+def get_magnitude_range(chart_data):
+    low = math.log(max(math.fabs(np.nanmin(chart_data['Low'])), 1e-7), 10) - 0.5
+    high = math.log(max(math.fabs(np.nanmax(chart_data['High'])), 1e-7), 10) + 0.5
+    return low, high
+
+
+def is_on_secondary_axis(addplot, magnitude_range):
+    if addplot['secondary_y'] != 'auto':
+        return bool(addplot['secondary_y'])
+
+    data = np.abs(np.asarray(addplot['data'], dtype=float))
+    if np.isnan(data).all():
+        return False
+
+    low = math.log(max(np.nanmin(data), 1e-7), 10)
+    high = math.log(max(np.nanmax(data), 1e-7), 10)
+    return low < magnitude_range[0] or high > magnitude_range[1]
+
+
+def get_overlay_signature(addplot, axis_index):
+    return (addplot['type'], axis_index, addplot['color'], addplot['label'], addplot['marker'], addplot['linestyle'], addplot['width'])
 
+
+def create_overlay_artist(axis, xvalues, ydata, addplot):
+    if addplot['type'] == 'scatter':
+        return axis.scatter(xvalues, ydata, s=addplot['markersize'], marker=addplot['marker'], color=addplot['color'], alpha=addplot['alpha'], label=addplot['label'])
+
+    line, = axis.plot(xvalues, ydata, linestyle=addplot['linestyle'], color=addplot['color'], linewidth=addplot['width'], alpha=addplot['alpha'], label=addplot['label'])
+    return line
+
+
+def update_overlay_artist(artist, xvalues, ydata, addplot):
+    if addplot['type'] == 'scatter':
+        artist.set_offsets(np.column_stack([xvalues, ydata]))
+    else:
+        artist.set_data(xvalues, ydata)
+
+
+def create_chart(chart_data, chart_settings):
     if chart_settings['chart_type'] == 'pnf':
         min_price = chart_data['Close'].min()
         max_price = chart_data['Close'].max()
@@ -100,13 +160,118 @@ def create_chart(chart_data, chart_settings):
                            returnfig=True,
                            title=chart_settings['symbol'],
                            style='yahoo',
-                           figscale=3,
-                           addplot=add_plots(chart_data, chart_settings),
-                           hlines=peaks_and_lows.add_horizontal_lines(chart_data, chart_settings))
+                           figscale=3)
 
     return fig, ax
 
 
+class ChartRenderer:
+    def __init__(self, parent):
+        self.parent = parent
+
+        self.fig = None
+        self.ax = None
+        self.canvas = None
+        self.base_key = None
+        self.overlays = []
+        self.horizontal_lines = []
+
+    def render(self, chart_data, chart_settings, preview=False):
+        if get_base_key(chart_data, chart_settings) != self.base_key:
+            self.create_base_chart(chart_data, chart_settings)
+
+        if chart_settings['chart_type'] != 'pnf':
+            analysis_context = AnalysisContext(chart_data, chart_settings)
+            self.update_overlays(analysis_context, preview)
+            self.update_horizontal_lines(peaks_and_lows.add_horizontal_lines(analysis_context))
+
+        configure_scale(self.ax, chart_settings)
+        configure_legend(self.ax)
+        self.canvas.draw_idle()
+
+    def create_base_chart(self, chart_data, chart_settings):
+        previous_fig = self.fig
+
+        self.fig, self.ax = create_chart(chart_data, chart_settings)
+        self.base_key = get_base_key(chart_data, chart_settings)
+        self.overlays = []
+        self.horizontal_lines = []
+
+        if self.parent is None:
+            self.canvas = self.fig.canvas
+            return
+
+        plt.close(self.fig)
+
+        if self.canvas is None:
+            self.canvas = FigureCanvasTkAgg(self.fig, self.parent)
+            self.canvas.get_tk_widget().pack()
+        else:
+            self.fig.set_size_inches(previous_fig.get_size_inches(), forward=False)
+            self.fig.set_canvas(self.canvas)
+            self.canvas.figure = self.fig
+
+    def update_overlays(self, analysis_context, preview):
+        chart_data = analysis_context.chart_data
+        xvalues = get_xvalues(chart_data, analysis_context.chart_settings)
+        magnitude_range = get_magnitude_range(chart_data)
+        overlays = []
+
+        for index, addplot in enumerate(add_plots(analysis_context, preview)):
+            axis_index = 1 if is_on_secondary_axis(addplot, magnitude_range) else 0
+            axis = self.ax[axis_index]
+            signature = get_overlay_signature(addplot, axis_index)
+            ydata = np.asarray(addplot['data'], dtype=float)
+
+            if index < len(self.overlays) and self.overlays[index][0] == signature:
+                artist = self.overlays[index][1]
+                update_overlay_artist(artist, xvalues, ydata, addplot)
+            else:
+                artist = create_overlay_artist(axis, xvalues, ydata, addplot)
+
+            if addplot['ylabel'] is not None:
+                axis.set_ylabel(addplot['ylabel'])
+
+            overlays.append((signature, artist))
+
+        reused_artists = {id(artist) for signature, artist in overlays}
+        for signature, artist in self.overlays:
+            if id(artist) not in reused_artists:
+                artist.remove()
+        self.overlays = overlays
+
+        is_secondary_axis_used = any(signature[1] == 1 for signature, artist in self.overlays)
+        self.ax[1].set_visible(is_secondary_axis_used)
+        if is_secondary_axis_used:
+            self.ax[1].relim()
+            self.ax[1].autoscale_view()
+
+    def update_horizontal_lines(self, horizontal_lines):
+        for line in self.horizontal_lines:
+            line.remove()
+        self.horizontal_lines = []
+
+        if not horizontal_lines:
+            return
+
+        for value, color in zip(horizontal_lines['hlines'], horizontal_lines['colors']):
+            self.horizontal_lines.append(self.ax[0].axhline(value,
+                                                            color=color,
+                                                            linestyle=horizontal_lines['linestyle'],
+                                                            linewidth=horizontal_lines['linewidths']))
+
+    def release(self):
+        if self.canvas is not None and self.parent is not None:
+            self.canvas.get_tk_widget().destroy()
+
+        self.fig = None
+        self.ax = None
+        self.canvas = None
+        self.base_key = None
+        self.overlays = []
+        self.horizontal_lines = []
+
+
 class Chart:
     def __init__(self, parent):
         self.parent = parent
@@ -115,36 +280,40 @@ class Chart:
 
         self.chart_frame = tk.LabelFrame(self.parent)
         self.chart_frame.pack()
+        self.chart_renderer = ChartRenderer(self.chart_frame)
 
     def destroy_widgets(self):
         for widget in self.parent.winfo_children():
             widget.destroy()
 
     def clear_chart_frame(self):
-        for widget in self.chart_frame.winfo_children():
-            widget.destroy()
-
-    def plot_chart(self, chart_settings):
-        self.clear_chart_frame()
+        self.chart_renderer.release()
 
+    def plot_chart(self, chart_settings, preview=False):
         if chart_settings['symbol'] == '':
+            self.clear_chart_frame()
             return
 
         chart_data = csv_handler.load_chart_data(chart_settings['symbol'],
-                                            chart_settings['interval'],
-                                            get_start_date(chart_settings))
+                                                 chart_settings['interval'],
+                                                 get_start_date(chart_settings))
 
         if len(chart_data) == 0:
+            self.clear_chart_frame()
             return
 
-        fig, ax = create_chart(chart_data, chart_settings)
-        configure_legend(ax, chart_settings)
-
-        chart_canvas = FigureCanvasTkAgg(fig, self.chart_frame)
-        chart_canvas.draw()
-        chart_canvas.get_tk_widget().pack()
+        self.chart_renderer.render(chart_data, chart_settings, preview)
 
     def plot_fullscreen(self, chart_settings):
-        if txt_handler.is_security_in_security_list(chart_settings['symbol']):
-            self.plot_chart(chart_settings)
-            mpf.show()
+        if not metadata_store.is_security_in_security_list(chart_settings['symbol']):
+            return
+
+        chart_data = csv_handler.load_chart_data(chart_settings['symbol'],
+                                                 chart_settings['interval'],
+                                                 get_start_date(chart_settings))
+
+        if len(chart_data) == 0:
+            return
+
+        ChartRenderer(None).render(chart_data, chart_settings)
+        mpf.show()
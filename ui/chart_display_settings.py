@@ -24,14 +24,19 @@ def create_label(parent, text, row, column):
 
 
 def create_option_menu(parent, variable, values, command, row, column):
-    ttk.OptionMenu(parent, variable, variable.get(), *values, command=command).grid(row=row, column=column)
+    option_menu = ttk.OptionMenu(parent, variable, variable.get(), *values, command=command)
+    option_menu.grid(row=row, column=column)
+    return option_menu
 
 
 def get_time_periods(interval):
     time_periods_map = {
         '1d': ['1 week', '1 month', '6 months', '1 year', '5 years', '10 years', '20 years'],
+        '2d': ['1 month', '6 months', '1 year', '5 years', '10 years', '20 years'],
         '1wk': ['1 month', '6 months', '1 year', '5 years', '10 years', '20 years'],
-        '1mo': ['6 months', '1 year', '5 years', '10 years', '20 years']
+        '1mo': ['6 months', '1 year', '5 years', '10 years', '20 years'],
+        '3mo': ['1 year', '5 years', '10 years', '20 years'],
+        '1y': ['5 years', '10 years', '20 years']
     }
     return time_periods_map.get(interval)
 
@@ -50,8 +55,11 @@ def validate_spinbox_value(value):
 class ChartDisplaySettings:
     INTERVALS = {
         'daily': '1d',
+        'every 2 days': '2d',
         'weekly': '1wk',
-        'monthly': '1mo'
+        'monthly': '1mo',
+        'quarterly': '3mo',
+        'yearly': '1y'
     }
     CHART_TYPES = {
         'line chart': 'line',
@@ -60,10 +68,10 @@ class ChartDisplaySettings:
         'point & figure chart': 'pnf'
     }
 
-    def __init__(self, parent, chart_settings, chart_settings_changed, plot_fullscreen, save_chart_settings):
+    def __init__(self, parent, chart_settings, settings_scheduler, plot_fullscreen, save_chart_settings):
         self.parent = parent
         self.chart_settings = chart_settings
-        self.chart_settings_changed = chart_settings_changed
+        self.settings_scheduler = settings_scheduler
         self.plot_fullscreen = plot_fullscreen
         self.save_chart_settings = save_chart_settings
 
@@ -78,6 +86,7 @@ class ChartDisplaySettings:
         self.time_periods = get_time_periods(self.chart_settings['interval'])
 
         self.option_menu_frame = None
+        self.time_period_option_menu = None
         self.checkbutton_frame = None
         self.button_frame = None
         self.box_size_spinbox = None
@@ -108,9 +117,9 @@ class ChartDisplaySettings:
             self.box_size.set(self.chart_settings['box_size'])
             return False
 
-    def update_chart_settings(self, *args):
+    def store_chart_settings(self):
         if not self.validate_spinbox_input():
-            return
+            return False
 
         self.chart_settings.update({
             'time_period': self.time_period.get(),
@@ -119,22 +128,29 @@ class ChartDisplaySettings:
             'show_logarithmic_scale': self.show_logarithmic_scale.get(),
             'box_size': self.box_size.get()
         })
-        self.chart_settings_changed()
+        return True
+
+    def update_chart_settings(self, *args):
+        if self.store_chart_settings():
+            self.settings_scheduler.schedule()
+
+    def confirm_chart_settings(self, *args):
+        if self.store_chart_settings():
+            self.settings_scheduler.commit()
 
     def interval_changed(self, *args):
         self.chart_settings['interval'] = self.INTERVALS[self.presented_interval.get()]
         self.adjust_time_period()
-        self.chart_settings_changed()
+        self.settings_scheduler.commit()
 
     def adjust_time_period(self):
-        if self.chart_settings['interval'] == '1wk' and self.chart_settings['time_period'] == '1 week':
-            self.chart_settings['time_period'] = '1 month'
-        if self.chart_settings['interval'] == '1mo' and (self.chart_settings['time_period'] == '1 week' or self.chart_settings['time_period'] == '1 month'):
-            self.chart_settings['time_period'] = '6 months'
+        time_periods = get_time_periods(self.chart_settings['interval'])
+        if self.chart_settings['time_period'] not in time_periods:
+            self.chart_settings['time_period'] = time_periods[0]
 
     def chart_type_changed(self, *args):
         self.chart_settings['chart_type'] = self.CHART_TYPES[self.presented_chart_type.get()]
-        self.update_chart_settings()
+        self.confirm_chart_settings()
 
     def create_widgets(self):
         self.create_option_menu_frame()
@@ -150,7 +166,7 @@ class ChartDisplaySettings:
         create_option_menu(self.option_menu_frame, self.presented_interval, list(self.INTERVALS.keys()), self.interval_changed, 1, 1)
 
         create_label(self.option_menu_frame, 'Time Period', 2, 0)
-        create_option_menu(self.option_menu_frame, self.time_period, self.time_periods, self.update_chart_settings, 2, 1)
+        self.time_period_option_menu = create_option_menu(self.option_menu_frame, self.time_period, self.time_periods, self.confirm_chart_settings, 2, 1)
 
         create_label(self.option_menu_frame, 'Chart Type', 3, 0)
         create_option_menu(self.option_menu_frame, self.presented_chart_type, list(self.CHART_TYPES.keys()), self.chart_type_changed, 3, 1)
@@ -170,19 +186,38 @@ class ChartDisplaySettings:
                                            validate='key',
                                            validatecommand=(validate_input, '%P'),
                                            command=self.update_chart_settings)
-        self.box_size_spinbox.bind('<FocusOut>', self.update_chart_settings)
-        self.box_size_spinbox.bind('<Return>', self.update_chart_settings)
+        self.box_size_spinbox.bind('<FocusOut>', self.confirm_chart_settings)
+        self.box_size_spinbox.bind('<Return>', self.confirm_chart_settings)
+        self.place_or_forget_box_size_spinbox()
+
+    def place_or_forget_box_size_spinbox(self):
         if self.chart_settings['chart_type'] == 'pnf':
             self.box_size_label.grid(row=5, column=0)
             self.box_size_spinbox.grid(row=5, column=1)
+        else:
+            self.box_size_label.grid_remove()
+            self.box_size_spinbox.grid_remove()
+
+    def update_widgets(self):
+        self.presented_interval.set(self.get_presented_interval(self.chart_settings['interval']))
+        self.presented_chart_type.set(self.get_presented_chart_type(self.chart_settings['chart_type']))
+        self.show_volume.set(self.chart_settings['show_volume'])
+        self.show_nontrading.set(self.chart_settings['show_nontrading'])
+        self.show_logarithmic_scale.set(self.chart_settings['show_logarithmic_scale'])
+        self.box_size.set(self.chart_settings['box_size'])
+
+        self.time_periods = get_time_periods(self.chart_settings['interval'])
+        self.time_period_option_menu.set_menu(self.chart_settings['time_period'], *self.time_periods)
+
+        self.place_or_forget_box_size_spinbox()
 
     def create_checkbutton_frame(self):
         self.checkbutton_frame = tk.Frame(self.parent)
         self.checkbutton_frame.pack(pady=8)
 
-        create_checkbutton(self.checkbutton_frame, 'Volume', self.show_volume, self.update_chart_settings)
-        create_checkbutton(self.checkbutton_frame, 'non-Trading days', self.show_nontrading, self.update_chart_settings)
-        create_checkbutton(self.checkbutton_frame, 'logarithmic scale', self.show_logarithmic_scale, self.update_chart_settings)
+        create_checkbutton(self.checkbutton_frame, 'Volume', self.show_volume, self.confirm_chart_settings)
+        create_checkbutton(self.checkbutton_frame, 'non-Trading days', self.show_nontrading, self.confirm_chart_settings)
+        create_checkbutton(self.checkbutton_frame, 'logarithmic scale', self.show_logarithmic_scale, self.confirm_chart_settings)
 
     def create_button_frame(self):
         self.button_frame = tk.Frame(self.parent)
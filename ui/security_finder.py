@@ -3,7 +3,13 @@ from PIL import Image
 import customtkinter as ctk
 import tkinter as tk
 
-from file_handler import csv_handler, txt_handler
+from file_handler import csv_handler, metadata_store
+from file_handler.security_universe import get_security_universe
+from ui.security_search_index import SecuritySearchIndex
+
+
+LIST_BOX_HEIGHT = 15
+RESULT_PAGE_SIZE = 50
 
 
 def create_button(parent, text, command):
@@ -11,7 +17,7 @@ def create_button(parent, text, command):
 
 
 class SecurityFinder:
-    def __init__(self, parent, entry_confirmed, plot_chart, request_historical_market_information, remove_security, security_portfolio, remove_chart_settings, load_chart_settings):
+    def __init__(self, parent, entry_confirmed, plot_chart, request_historical_market_information, remove_security, security_portfolio, remove_chart_settings, load_chart_settings, fetch_status, refresh_all_securities):
         self.parent = parent
         self.entry_confirmed = entry_confirmed
         self.plot_chart = plot_chart
@@ -20,21 +26,33 @@ class SecurityFinder:
         self.security_portfolio = security_portfolio
         self.remove_chart_settings = remove_chart_settings
         self.load_chart_settings = load_chart_settings
+        self.fetch_status = fetch_status
+        self.refresh_all_securities = refresh_all_securities
 
-        self.stocks_and_etf_list = csv_handler.create_stocks_and_etf_list()
+        self.security_search_index = None
         self.edited_stocks_and_etf_list = []
-        self.list_box_height = tk.IntVar(value=30)
+        self.has_more_results = False
+        self.list_box_height = tk.IntVar(value=LIST_BOX_HEIGHT)
+        self.portfolio_labels = {}
 
         self.security_list_frame = None
         self.list_box = None
+        self.list_box_scrollbar = None
         self.list_box_frame = None
         self.entry = None
         self.magnifying_glass_image = None
         self.entry_frame = None
+        self.fetch_status_label = None
 
         self.destroy_widgets()
         self.create_widgets()
 
+    def get_security_search_index(self):
+        if self.security_search_index is None:
+            security_universe = get_security_universe()
+            self.security_search_index = SecuritySearchIndex(security_universe.entries, security_universe.symbols)
+        return self.security_search_index
+
     def destroy_widgets(self):
         for widget in self.parent.winfo_children():
             widget.destroy()
@@ -63,11 +81,16 @@ class SecurityFinder:
         create_button(self.entry_frame, 'X', self.delete_button_commands)
         create_button(self.entry_frame, 'Search', self.confirm_entry)
 
+        self.fetch_status_label = ctk.CTkLabel(self.parent, textvariable=self.fetch_status, height=0)
+        self.fetch_status_label.pack(fill=tk.X)
+
     def create_list_box_frame(self):
         self.list_box_frame = tk.LabelFrame(self.parent)
         self.list_box_frame.pack(fill=tk.X)
 
-        self.list_box = tk.Listbox(self.list_box_frame, width=20, height=self.list_box_height.get())
+        self.list_box_scrollbar = tk.Scrollbar(self.list_box_frame, orient=tk.VERTICAL)
+        self.list_box = tk.Listbox(self.list_box_frame, width=20, height=self.list_box_height.get(), yscrollcommand=self.list_box_scrolled)
+        self.list_box_scrollbar.config(command=self.list_box.yview)
         self.list_box.bind('<<ListboxSelect>>', self.fillout_entry)
         self.list_box.bind('<<ListboxSelect>>', self.forget_list_box, add="+")
 
@@ -99,16 +122,31 @@ class SecurityFinder:
         typed = self.entry.get()
 
         if typed:
-            self.edited_stocks_and_etf_list = [stock_or_etf for stock_or_etf in self.stocks_and_etf_list if typed.lower() in stock_or_etf.lower()]
+            self.edited_stocks_and_etf_list = self.get_security_search_index().search(typed, RESULT_PAGE_SIZE)
+        self.has_more_results = len(self.edited_stocks_and_etf_list) == RESULT_PAGE_SIZE
 
     def update_list_box(self, *args):
         self.list_box.delete(0, tk.END)
-        for stock_or_etf in self.edited_stocks_and_etf_list:
-            self.list_box.insert(tk.END, stock_or_etf)
-        self.list_box_height.set(len(self.edited_stocks_and_etf_list))
+        self.list_box.insert(tk.END, *self.edited_stocks_and_etf_list)
+        self.list_box.yview_moveto(0)
+        self.list_box_height.set(min(len(self.edited_stocks_and_etf_list), LIST_BOX_HEIGHT))
         self.list_box.config(height=self.list_box_height.get())
 
+    def list_box_scrolled(self, first, last):
+        self.list_box_scrollbar.set(first, last)
+        if self.has_more_results and float(last) == 1.0:
+            self.load_more_results()
+
+    def load_more_results(self):
+        loaded = len(self.edited_stocks_and_etf_list)
+        more_results = self.get_security_search_index().search(self.entry.get(), loaded + RESULT_PAGE_SIZE)[loaded:]
+
+        self.has_more_results = len(more_results) == RESULT_PAGE_SIZE
+        self.edited_stocks_and_etf_list.extend(more_results)
+        self.list_box.insert(tk.END, *more_results)
+
     def forget_list_box(self, *args):
+        self.list_box_scrollbar.forget()
         self.list_box.forget()
         self.list_box_frame.forget()
 
@@ -117,27 +155,53 @@ class SecurityFinder:
             self.forget_list_box()
         else:
             self.list_box_frame.pack(fill=tk.X)
+            self.list_box_scrollbar.pack(side='right', fill=tk.Y)
             self.list_box.pack(fill=tk.BOTH)
             self.security_list_frame.forget()
             self.security_list_frame.pack(fill=tk.X)
 
-    def update_security_list(self):
-        security_list = txt_handler.get_security_list()
+    def update_security_list(self, security_portfolio=None):
+        if security_portfolio is not None:
+            self.security_portfolio = security_portfolio
+
+        for widget in self.security_list_frame.winfo_children():
+            widget.destroy()
+        self.portfolio_labels = {}
+
+        security_list = metadata_store.get_security_list()
+        chart_settings_lists = metadata_store.get_chart_settings_lists()
         if len(security_list) == 0:
             self.security_list_frame.forget()
         else:
             self.security_list_frame.pack(fill=tk.X)
+            self.create_refresh_all_frame()
             for symbol in security_list:
                 self.create_security_frame(symbol)
-                self.create_saved_settings_frame(symbol)
+                self.create_saved_settings_frame(symbol, chart_settings_lists.get(symbol, []))
+
+    def create_refresh_all_frame(self):
+        refresh_all_frame = tk.Frame(self.security_list_frame)
+        refresh_all_frame.pack(fill=tk.X)
+
+        unicode_character = '\u21BB'
+        tk.Button(refresh_all_frame, text=f'{unicode_character} Refresh all', command=self.refresh_all_securities).pack(expand=True, fill=tk.X)
+
+    def get_portfolio_label_text(self, symbol):
+        pieces_owned = self.security_portfolio.get_pieces_owned(symbol)
+        last_close = csv_handler.get_last_close(symbol, csv_handler.STORED_INTERVAL)
+        last_close_text = '–' if last_close is None else f'{last_close:.2f}'
+        return f'{last_close_text}  ' + ('Portfolio' if pieces_owned > 0 else 'Watchlist')
 
     def create_portfolio_label(self, parent, symbol):
-        pieces_owned = sum(security['pieces_owned'] for security in self.security_portfolio if security['symbol'] == symbol)
-        label_text = 'Portfolio' if pieces_owned > 0 else 'Watchlist'
-        ctk.CTkLabel(parent, text=label_text).pack(side='left')
+        self.portfolio_labels[symbol] = tk.StringVar(value=self.get_portfolio_label_text(symbol))
+        ctk.CTkLabel(parent, textvariable=self.portfolio_labels[symbol]).pack(side='left')
+
+    def update_portfolio_labels(self, security_portfolio):
+        self.security_portfolio = security_portfolio
+        for symbol, portfolio_label in self.portfolio_labels.items():
+            portfolio_label.set(self.get_portfolio_label_text(symbol))
 
-    def create_saved_settings_frame(self, symbol):
-        saved_settings = txt_handler.get_chart_settings_list(symbol)
+    def create_saved_settings_frame(self, symbol, saved_settings):
         for setting in saved_settings:
             saved_settings_frame = tk.Frame(self.security_list_frame)
             saved_settings_frame.pack(fill=tk.X)
@@ -1,13 +1,17 @@
 import customtkinter as ctk
 import tkinter as tk
 
-from file_handler import csv_handler, json_handler
+from file_handler import csv_handler
 
 
 def create_label(parent, text, row, column):
     ctk.CTkLabel(parent, text=text).grid(row=row, column=column)
 
 
+def create_variable_label(parent, variable, row, column):
+    ctk.CTkLabel(parent, textvariable=variable).grid(row=row, column=column)
+
+
 def validate_spinbox_value(value):
     if value == '':
         return True
@@ -60,45 +64,64 @@ def validate_entry_value(value):
 
 
 class SecurityPortfolioManager:
-    def __init__(self, parent, chart_settings, buy_security, sell_security):
+    def __init__(self, parent, chart_settings, security_portfolio, buy_security, sell_security):
         self.parent = parent
         self.chart_settings = chart_settings
+        self.security_portfolio = security_portfolio
         self.buy_security = buy_security
         self.sell_security = sell_security
 
-        self.symbol = self.chart_settings['symbol']
-        self.interval = self.chart_settings['interval']
-
-        self.current_price = csv_handler.get_current_price(self.symbol, self.interval)
-        self.pieces_owned, self.total_purchase_price = self.get_current_ownership_info()
-        self.current_total = tk.DoubleVar(value=self.current_price * self.pieces_owned)
-        self.purchase_price_difference = self.current_total.get() - self.total_purchase_price
-        self.purchase_price_difference_in_percent = self.get_purchase_price_difference_in_percent()
+        self.symbol = None
+        self.current_price = None
+        self.pieces_owned = 0
+        self.total_purchase_price = 0
+        self.current_total = tk.DoubleVar()
+        self.purchase_price_difference = 0
+        self.purchase_price_difference_in_percent = 0
         self.buy_sell_pieces = tk.IntVar()
         self.buy_sell_price = tk.DoubleVar()
-        self.buy_sell_price.set(float(f'{self.current_price:.2f}'))
+
+        self.current_price_text = tk.StringVar()
+        self.pieces_owned_text = tk.StringVar()
+        self.current_total_text = tk.StringVar()
+        self.purchase_price_difference_text = tk.StringVar()
 
         self.buy_sell_price_entry = None
 
         self.destroy_widgets()
         self.create_widgets()
+        self.update_widgets()
 
     def destroy_widgets(self):
         for widget in self.parent.winfo_children():
             widget.destroy()
 
-    def get_current_ownership_info(self):
-        pieces_owned = 0
-        total_purchase_price = 0
-        security_portfolio = json_handler.load_security_portfolio()
+    def update_widgets(self):
+        self.symbol = self.chart_settings['symbol']
+
+        self.current_price = csv_handler.get_last_close(self.symbol, csv_handler.STORED_INTERVAL)
+        self.pieces_owned, self.total_purchase_price = self.get_current_ownership_info()
+        self.pieces_owned_text.set(self.pieces_owned)
+        if self.current_price is None:
+            self.current_total.set(0.00)
+            self.purchase_price_difference = 0
+            self.buy_sell_price.set(0.00)
+            self.current_price_text.set('–')
+            self.current_total_text.set('–')
+            self.purchase_price_difference_text.set('')
+            return
+
+        self.current_total.set(self.current_price * self.pieces_owned)
+        self.purchase_price_difference = self.current_total.get() - self.total_purchase_price
+        self.purchase_price_difference_in_percent = self.get_purchase_price_difference_in_percent()
+        self.buy_sell_price.set(float(f'{self.current_price:.2f}'))
 
-        for security in security_portfolio:
-            if security['symbol'] == self.chart_settings['symbol']:
-                pieces_owned = security['pieces_owned']
-                total_purchase_price = security['total_purchase_price']
-                break
+        self.current_price_text.set(f'{self.current_price:.2f}')
+        self.current_total_text.set(f'{self.current_total.get():.2f}')
+        self.purchase_price_difference_text.set(f'({self.purchase_price_difference:+.2f}, {self.purchase_price_difference_in_percent:+.2f}%)')
 
-        return pieces_owned, total_purchase_price
+    def get_current_ownership_info(self):
+        return self.security_portfolio.get_ownership_info(self.chart_settings['symbol'])
 
     def get_purchase_price_difference_in_percent(self):
         if self.total_purchase_price != 0:
@@ -115,14 +138,14 @@ class SecurityPortfolioManager:
         ctk.CTkLabel(self.parent, text='Current Ownership', font=('TkDefaultFont', 18)).grid(row=1, column=0)
 
         create_label(self.parent, 'Current Price: ', 2, 0)
-        create_label(self.parent, f'{self.current_price:.2f}', 2, 1)
+        create_variable_label(self.parent, self.current_price_text, 2, 1)
 
         create_label(self.parent, 'Pieces: ', 3, 0)
-        create_label(self.parent, self.pieces_owned, 3, 1)
+        create_variable_label(self.parent, self.pieces_owned_text, 3, 1)
 
         create_label(self.parent, 'Total: ', 4, 0)
-        create_label(self.parent, f'{self.current_total.get():.2f}', 4, 1)
-        create_label(self.parent, f'({self.purchase_price_difference:+.2f}, {self.purchase_price_difference_in_percent:+.2f}%)', 4, 2)
+        create_variable_label(self.parent, self.current_total_text, 4, 1)
+        create_variable_label(self.parent, self.purchase_price_difference_text, 4, 2)
 
         ctk.CTkLabel(self.parent, text='').grid(row=5, column=0)
 
@@ -0,0 +1,70 @@
+import heapq
+
+
+NGRAM_SIZE = 3
+MAX_RESULTS = 50
+
+
+def get_ngrams(text):
+    return {text[i:i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
+
+
+class SecuritySearchIndex:
+    def __init__(self, entries, symbols):
+        self.entries = entries
+        self.lowered_entries = [entry.lower() for entry in entries]
+        self.lowered_symbols = [symbol.lower() for symbol in symbols]
+        self.postings = {}
+
+        for position, lowered_entry in enumerate(self.lowered_entries):
+            for ngram in get_ngrams(lowered_entry):
+                self.postings.setdefault(ngram, []).append(position)
+
+        self.last_query = ''
+        self.last_matches = range(len(entries))
+
+    def find_candidates(self, query):
+        candidates = range(len(self.entries))
+
+        if len(query) >= NGRAM_SIZE:
+            candidates = min((self.postings.get(ngram, []) for ngram in get_ngrams(query)), key=len)
+
+        if self.last_query in query and len(self.last_matches) < len(candidates):
+            candidates = self.last_matches
+
+        return candidates
+
+    def find_matches(self, query):
+        matches = [position for position in self.find_candidates(query) if query in self.lowered_entries[position]]
+
+        self.last_query = query
+        self.last_matches = matches
+
+        return matches
+
+    def get_rank(self, position, query):
+        lowered_symbol = self.lowered_symbols[position]
+        lowered_entry = self.lowered_entries[position]
+
+        if lowered_symbol == query:
+            relevance = 0
+        elif lowered_symbol.startswith(query):
+            relevance = 1
+        elif lowered_entry.startswith(query):
+            relevance = 2
+        elif ' ' + query in lowered_entry:
+            relevance = 3
+        else:
+            relevance = 4
+
+        return relevance, len(lowered_entry), position
+
+    def search(self, query, max_results=MAX_RESULTS):
+        query = query.lower()
+        if query == '':
+            return []
+
+        matches = self.find_matches(query)
+        ranked_matches = heapq.nsmallest(max_results, matches, key=lambda position: self.get_rank(position, query))
+
+        return [self.entries[position] for position in ranked_matches]
@@ -0,0 +1,43 @@
+DEBOUNCE_MS = 250
+PREVIEW_INTERVAL_MS = 80
+
+
+class SettingsScheduler:
+    def __init__(self, root, settings_previewed, settings_changed):
+        self.root = root
+        self.settings_previewed = settings_previewed
+        self.settings_changed = settings_changed
+
+        self.preview_id = None
+        self.change_id = None
+
+    def preview(self):
+        if self.preview_id is None:
+            self.preview_id = self.root.after(PREVIEW_INTERVAL_MS, self.run_preview)
+
+    def schedule(self):
+        if self.change_id is not None:
+            self.root.after_cancel(self.change_id)
+        self.change_id = self.root.after(DEBOUNCE_MS, self.run_change)
+
+    def commit(self):
+        self.cancel()
+        self.settings_changed()
+
+    def run_preview(self):
+        self.preview_id = None
+        if self.change_id is None:
+            self.settings_previewed()
+
+    def run_change(self):
+        self.change_id = None
+        self.commit()
+
+    def cancel(self):
+        if self.preview_id is not None:
+            self.root.after_cancel(self.preview_id)
+            self.preview_id = None
+
+        if self.change_id is not None:
+            self.root.after_cancel(self.change_id)
+            self.change_id = None
@@ -41,18 +41,20 @@ def enforce_spinbox_limit(spinbox):
         return
 
 
-def create_spinbox(parent, variable, row, column, command):
+def create_spinbox(parent, variable, row, column, command, confirm_command):
     validate_input = parent.register(validate_spinbox_value)
 
     spinbox = tk.Spinbox(parent, from_=2, to=200, textvariable=variable, width=5, validate='key', validatecommand=(validate_input, '%P'), command=command)
     spinbox.grid(row=row, column=column)
-    spinbox.bind('<FocusOut>', lambda event: (enforce_spinbox_limit(spinbox), command()))
-    spinbox.bind('<Return>', lambda event: (enforce_spinbox_limit(spinbox), command()))
+    spinbox.bind('<FocusOut>', lambda event: (enforce_spinbox_limit(spinbox), confirm_command()))
+    spinbox.bind('<Return>', lambda event: (enforce_spinbox_limit(spinbox), confirm_command()))
 
 
-def create_slider(parent, label_text, variable, label_row, label_column, slider_row, slider_column, command):
+def create_slider(parent, label_text, variable, label_row, label_column, slider_row, slider_column, command, confirm_command):
     ctk.CTkLabel(parent, text=label_text).grid(row=label_row, column=label_column)
-    ctk.CTkSlider(parent, from_=10, to=400, variable=variable, command=command).grid(row=slider_row, column=slider_column)
+    slider = ctk.CTkSlider(parent, from_=10, to=400, variable=variable, command=command)
+    slider.grid(row=slider_row, column=slider_column)
+    slider.bind('<ButtonRelease-1>', confirm_command)
 
 
 def create_label(parent, variable, row, column):
@@ -60,10 +62,10 @@ def create_label(parent, variable, row, column):
 
 
 class TechnicalIndicatorsSettingsLeft:
-    def __init__(self, parent, chart_settings, chart_settings_changed):
+    def __init__(self, parent, chart_settings, settings_scheduler):
         self.parent = parent
         self.chart_settings = chart_settings
-        self.chart_settings_changed = chart_settings_changed
+        self.settings_scheduler = settings_scheduler
 
         self.show_mav1 = tk.BooleanVar(value=self.chart_settings['show_mav1'])
         self.mav1 = tk.IntVar(value=self.chart_settings['mav1'])
@@ -97,9 +99,9 @@ class TechnicalIndicatorsSettingsLeft:
         self.mav2.set(self.chart_settings['mav2'])
         self.mav3.set(self.chart_settings['mav3'])
 
-    def update_chart_settings(self, *args):
+    def store_chart_settings(self):
         if not self.validate_spinbox_inputs():
-            return
+            return False
 
         self.chart_settings.update({
             'show_mav1': self.show_mav1.get(),
@@ -112,25 +114,48 @@ class TechnicalIndicatorsSettingsLeft:
             'best_peaks_significance': self.best_peaks_significance.get(),
             'best_lows_significance': self.best_lows_significance.get()
         })
-        self.chart_settings_changed()
+        return True
+
+    def preview_chart_settings(self, *args):
+        if self.store_chart_settings():
+            self.settings_scheduler.preview()
+
+    def update_chart_settings(self, *args):
+        if self.store_chart_settings():
+            self.settings_scheduler.schedule()
+
+    def confirm_chart_settings(self, *args):
+        if self.store_chart_settings():
+            self.settings_scheduler.commit()
+
+    def update_widgets(self):
+        self.show_mav1.set(self.chart_settings['show_mav1'])
+        self.mav1.set(self.chart_settings['mav1'])
+        self.show_mav2.set(self.chart_settings['show_mav2'])
+        self.mav2.set(self.chart_settings['mav2'])
+        self.show_mav3.set(self.chart_settings['show_mav3'])
+        self.mav3.set(self.chart_settings['mav3'])
+        self.show_best_peaks_and_lows.set(self.chart_settings['show_best_peaks_and_lows'])
+        self.best_peaks_significance.set(self.chart_settings['best_peaks_significance'])
+        self.best_lows_significance.set(self.chart_settings['best_lows_significance'])
 
     def create_widgets(self):
-        create_checkbutton(self.parent, 'Moving Average 1', self.show_mav1, 1, 0, self.update_chart_settings)
-        create_spinbox(self.parent, self.mav1, 1, 1, self.update_chart_settings)
+        create_checkbutton(self.parent, 'Moving Average 1', self.show_mav1, 1, 0, self.confirm_chart_settings)
+        create_spinbox(self.parent, self.mav1, 1, 1, self.update_chart_settings, self.confirm_chart_settings)
 
-        create_checkbutton(self.parent, 'Moving Average 2', self.show_mav2, 2, 0, self.update_chart_settings)
-        create_spinbox(self.parent, self.mav2, 2, 1, self.update_chart_settings)
+        create_checkbutton(self.parent, 'Moving Average 2', self.show_mav2, 2, 0, self.confirm_chart_settings)
+        create_spinbox(self.parent, self.mav2, 2, 1, self.update_chart_settings, self.confirm_chart_settings)
 
-        create_checkbutton(self.parent, 'Moving Average 3', self.show_mav3, 3, 0, self.update_chart_settings)
-        create_spinbox(self.parent, self.mav3, 3, 1, self.update_chart_settings)
+        create_checkbutton(self.parent, 'Moving Average 3', self.show_mav3, 3, 0, self.confirm_chart_settings)
+        create_spinbox(self.parent, self.mav3, 3, 1, self.update_chart_settings, self.confirm_chart_settings)
 
         ctk.CTkLabel(self.parent, text='').grid(row=4, column=0)
 
-        create_checkbutton(self.parent, 'Peaks and Lows', self.show_best_peaks_and_lows, 5, 0, self.update_chart_settings)
+        create_checkbutton(self.parent, 'Peaks and Lows', self.show_best_peaks_and_lows, 5, 0, self.confirm_chart_settings)
 
-        create_slider(self.parent, 'Peak Significance', self.best_peaks_significance, 6, 0, 6, 1, self.update_chart_settings)
+        create_slider(self.parent, 'Peak Significance', self.best_peaks_significance, 6, 0, 6, 1, self.preview_chart_settings, self.confirm_chart_settings)
         create_label(self.parent, self.best_peaks_significance, 6, 2)
 
-        create_slider(self.parent, 'Low Significance', self.best_lows_significance, 7, 0, 7, 1, self.update_chart_settings)
+        create_slider(self.parent, 'Low Significance', self.best_lows_significance, 7, 0, 7, 1, self.preview_chart_settings, self.confirm_chart_settings)
 
         create_label(self.parent, self.best_lows_significance, 7, 2)
@@ -41,15 +41,15 @@ def enforce_spinbox_limit(spinbox):
         return
 
 
-def create_spinbox(parent, label_text, variable, label_row, label_column, spinbox_row, spinbox_column, command):
+def create_spinbox(parent, label_text, variable, label_row, label_column, spinbox_row, spinbox_column, command, confirm_command):
     ctk.CTkLabel(parent, text=label_text).grid(row=label_row, column=label_column)
 
     validate_input = parent.register(validate_spinbox_value)
 
     spinbox = tk.Spinbox(parent, from_=2, to=200, textvariable=variable, width=5, validate='key', validatecommand=(validate_input, '%P'), command=command)
     spinbox.grid(row=spinbox_row, column=spinbox_column)
-    spinbox.bind('<FocusOut>', lambda event: (enforce_spinbox_limit(spinbox), command()))
-    spinbox.bind('<Return>', lambda event: (enforce_spinbox_limit(spinbox), command()))
+    spinbox.bind('<FocusOut>', lambda event: (enforce_spinbox_limit(spinbox), confirm_command()))
+    spinbox.bind('<Return>', lambda event: (enforce_spinbox_limit(spinbox), confirm_command()))
 
 
 def create_vertical_spacer(parent, row, column):
@@ -57,10 +57,10 @@ def create_vertical_spacer(parent, row, column):
 
 
 class TechnicalIndicatorsSettingsRight:
-    def __init__(self, parent, chart_settings, chart_settings_changed):
+    def __init__(self, parent, chart_settings, settings_scheduler):
         self.parent = parent
         self.chart_settings = chart_settings
-        self.chart_settings_changed = chart_settings_changed
+        self.settings_scheduler = settings_scheduler
 
         self.show_percentage_bands = tk.BooleanVar(value=self.chart_settings['show_percentage_bands'])
         self.mav_for_percentage_bands = tk.IntVar(value=self.chart_settings['mav_for_percentage_bands'])
@@ -95,7 +95,7 @@ class TechnicalIndicatorsSettingsRight:
         self.percentage_for_percentage_bands.set(self.chart_settings['percentage_for_percentage_bands'])
         self.mav_for_bollinger_bands.set(self.chart_settings['mav_for_bollinger_bands'])
 
-    def update_chart_settings(self, *args):
+    def store_chart_settings(self):
         self.chart_settings.update({
             'show_percentage_bands': self.show_percentage_bands.get(),
             'mav_for_percentage_bands': self.mav_for_percentage_bands.get(),
@@ -105,19 +105,35 @@ class TechnicalIndicatorsSettingsRight:
             'show_on_balance_volume': self.show_on_balance_volume.get(),
             'show_candlestick_patterns': self.show_candlestick_patterns.get()
         })
-        self.chart_settings_changed()
+
+    def update_chart_settings(self, *args):
+        self.store_chart_settings()
+        self.settings_scheduler.schedule()
+
+    def confirm_chart_settings(self, *args):
+        self.store_chart_settings()
+        self.settings_scheduler.commit()
+
+    def update_widgets(self):
+        self.show_percentage_bands.set(self.chart_settings['show_percentage_bands'])
+        self.mav_for_percentage_bands.set(self.chart_settings['mav_for_percentage_bands'])
+        self.percentage_for_percentage_bands.set(self.chart_settings['percentage_for_percentage_bands'])
+        self.show_bollinger_bands.set(self.chart_settings['show_bollinger_bands'])
+        self.mav_for_bollinger_bands.set(self.chart_settings['mav_for_bollinger_bands'])
+        self.show_on_balance_volume.set(self.chart_settings['show_on_balance_volume'])
+        self.show_candlestick_patterns.set(self.chart_settings['show_candlestick_patterns'])
 
     def create_widgets(self):
-        create_checkbutton(self.parent, 'Percentage Bands', self.show_percentage_bands, 1, 0, self.update_chart_settings)
-        create_spinbox(self.parent, 'Moving Average', self.mav_for_percentage_bands, 1, 1, 1, 2, self.update_chart_settings)
-        create_spinbox(self.parent, 'Percentage', self.percentage_for_percentage_bands, 2, 1, 2, 2, self.update_chart_settings)
+        create_checkbutton(self.parent, 'Percentage Bands', self.show_percentage_bands, 1, 0, self.confirm_chart_settings)
+        create_spinbox(self.parent, 'Moving Average', self.mav_for_percentage_bands, 1, 1, 1, 2, self.update_chart_settings, self.confirm_chart_settings)
+        create_spinbox(self.parent, 'Percentage', self.percentage_for_percentage_bands, 2, 1, 2, 2, self.update_chart_settings, self.confirm_chart_settings)
 
         create_vertical_spacer(self.parent, 3, 0)
 
-        create_checkbutton(self.parent, 'Bollinger Bands', self.show_bollinger_bands, 4, 0, self.update_chart_settings)
-        create_spinbox(self.parent, 'Moving Average', self.mav_for_bollinger_bands, 4, 1, 4, 2, self.update_chart_settings)
+        create_checkbutton(self.parent, 'Bollinger Bands', self.show_bollinger_bands, 4, 0, self.confirm_chart_settings)
+        create_spinbox(self.parent, 'Moving Average', self.mav_for_bollinger_bands, 4, 1, 4, 2, self.update_chart_settings, self.confirm_chart_settings)
 
         create_vertical_spacer(self.parent, 5, 0)
 
-        create_checkbutton(self.parent, 'On Balance Volume', self.show_on_balance_volume, 6, 0, self.update_chart_settings)
-        create_checkbutton(self.parent, 'Candlestick Patterns', self.show_candlestick_patterns, 7, 0, self.update_chart_settings)
+        create_checkbutton(self.parent, 'On Balance Volume', self.show_on_balance_volume, 6, 0, self.confirm_chart_settings)
+        create_checkbutton(self.parent, 'Candlestick Patterns', self.show_candlestick_patterns, 7, 0, self.confirm_chart_settings)
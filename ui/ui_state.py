@@ -0,0 +1,72 @@
+SECURITY_LIST = 'security_list'
+CHART = 'chart'
+CHART_DISPLAY_SETTINGS = 'chart_display_settings'
+TECHNICAL_INDICATORS_SETTINGS_LEFT = 'technical_indicators_settings_left'
+TECHNICAL_INDICATORS_SETTINGS_RIGHT = 'technical_indicators_settings_right'
+SECURITY_PORTFOLIO = 'security_portfolio'
+
+ALL_FRAMES = [SECURITY_LIST,
+              CHART,
+              CHART_DISPLAY_SETTINGS,
+              TECHNICAL_INDICATORS_SETTINGS_LEFT,
+              TECHNICAL_INDICATORS_SETTINGS_RIGHT,
+              SECURITY_PORTFOLIO]
+
+CHART_SETTINGS_FRAMES = {
+    'symbol': [SECURITY_PORTFOLIO],
+    'interval': [CHART_DISPLAY_SETTINGS],
+    'chart_type': [CHART_DISPLAY_SETTINGS],
+    'time_period': [CHART_DISPLAY_SETTINGS],
+    'show_volume': [CHART_DISPLAY_SETTINGS],
+    'show_nontrading': [CHART_DISPLAY_SETTINGS],
+    'show_logarithmic_scale': [CHART_DISPLAY_SETTINGS],
+    'box_size': [CHART_DISPLAY_SETTINGS],
+    'show_mav1': [TECHNICAL_INDICATORS_SETTINGS_LEFT],
+    'show_mav2': [TECHNICAL_INDICATORS_SETTINGS_LEFT],
+    'show_mav3': [TECHNICAL_INDICATORS_SETTINGS_LEFT],
+    'mav1': [TECHNICAL_INDICATORS_SETTINGS_LEFT],
+    'mav2': [TECHNICAL_INDICATORS_SETTINGS_LEFT],
+    'mav3': [TECHNICAL_INDICATORS_SETTINGS_LEFT],
+    'show_best_peaks_and_lows': [TECHNICAL_INDICATORS_SETTINGS_LEFT],
+    'best_peaks_significance': [TECHNICAL_INDICATORS_SETTINGS_LEFT],
+    'best_lows_significance': [TECHNICAL_INDICATORS_SETTINGS_LEFT],
+    'show_percentage_bands': [TECHNICAL_INDICATORS_SETTINGS_RIGHT],
+    'mav_for_percentage_bands': [TECHNICAL_INDICATORS_SETTINGS_RIGHT],
+    'percentage_for_percentage_bands': [TECHNICAL_INDICATORS_SETTINGS_RIGHT],
+    'show_bollinger_bands': [TECHNICAL_INDICATORS_SETTINGS_RIGHT],
+    'mav_for_bollinger_bands': [TECHNICAL_INDICATORS_SETTINGS_RIGHT],
+    'show_candlestick_patterns': [TECHNICAL_INDICATORS_SETTINGS_RIGHT],
+    'show_on_balance_volume': [TECHNICAL_INDICATORS_SETTINGS_RIGHT]
+}
+
+
+class UIState:
+    def __init__(self, chart_settings):
+        self.chart_settings = chart_settings
+        self.rendered_chart_settings = {}
+        self.dirty_frames = set(ALL_FRAMES)
+
+    def mark_dirty(self, *frames):
+        self.dirty_frames.update(frames)
+
+    def replace_chart_settings(self, chart_settings):
+        self.chart_settings.clear()
+        self.chart_settings.update(chart_settings)
+
+    def get_changed_chart_settings(self):
+        return [key for key, value in self.chart_settings.items()
+                if key not in self.rendered_chart_settings or self.rendered_chart_settings[key] != value]
+
+    def collect_dirty_frames(self):
+        changed_chart_settings = self.get_changed_chart_settings()
+        if len(changed_chart_settings) > 0:
+            self.dirty_frames.add(CHART)
+
+        for key in changed_chart_settings:
+            self.dirty_frames.update(CHART_SETTINGS_FRAMES.get(key, []))
+
+        self.rendered_chart_settings = self.chart_settings.copy()
+
+        dirty_frames = self.dirty_frames
+        self.dirty_frames = set()
+        return dirty_frames